@@ -9,7 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from .throughput_data_processing import (
     normalize_test_data,
     aggregate_timestamps_and_find_stream_durations,
-    sum_all_bytecounts_across_http_streams
+    sum_all_bytecounts_across_http_streams,
+    byte_count_arrays,
+    ByteCount,
+    stream_arrays
 )
 
 from .latency_data_processing import (
@@ -41,6 +44,9 @@ __all__ = [
     'normalize_test_data',
     'aggregate_timestamps_and_find_stream_durations',
     'sum_all_bytecounts_across_http_streams',
+    'byte_count_arrays',
+    'ByteCount',
+    'stream_arrays',
     'extract_latencies',
 
     # Validation functions
@@ -4,16 +4,101 @@ This consolidates steps 1-3 of the pipeline.
 """
 import os
 import json
+import numpy as np
 from . import (
     normalize_test_data,
     aggregate_timestamps_and_find_stream_durations,
     sum_all_bytecounts_across_http_streams,
+    ByteCount,
+    byte_count_arrays,
     byte_count_validation
 )
 import utilities
 from statistics import StatisticsAccumulator
 
 
+# Bump when the layout of aggregated_time_cache.npz changes, so caches written by older code are recomputed
+_AGGREGATED_TIME_CACHE_VERSION = 1
+
+
+def _input_file_signature(file_paths):
+    # (file name, modification time) of every input file that exists, used to tell if a cache is stale
+    return [(os.path.basename(path), os.path.getmtime(path)) for path in file_paths if os.path.exists(path)]
+
+
+def _load_or_aggregate_timestamps(byte_list, socket_path, base_path, input_files):
+    """
+    Run aggregate_timestamps_and_find_stream_durations, caching its result in base_path so re-running the analysis
+    on the same test skips the aggregation. Like byte_count.npz, the cache is an npz file (read without pickle): the
+    timestamps as an int64 array and source_times as JSON. It stores a format version and the modification times of
+    the input files, and is recomputed if either changed.
+
+    Args:
+        byte_list: Normalized byte list (from normalize_test_data)
+        socket_path: Path to the socket IDs file
+        base_path: Test directory, where the cache file is written
+        input_files: Files the aggregation depends on (byte/current position lists, latency file)
+
+    Returns:
+        tuple: (aggregated_time, source_times, begin_time), aggregated_time being an int64 array
+    """
+    cache_file = os.path.join(base_path, "aggregated_time_cache.npz")
+    signature = json.dumps({
+        'version': _AGGREGATED_TIME_CACHE_VERSION,
+        'files': _input_file_signature(list(input_files) + [socket_path])
+    })
+
+    if os.path.exists(cache_file):
+        try:
+            with np.load(cache_file) as cached:
+                if str(cached['signature']) == signature:
+                    print("Loading cached aggregated timestamps")
+                    aggregated_time = cached['aggregated_time']
+                    # Stored as [source_id, times] pairs, since JSON object keys would turn integer ids into strings
+                    source_times = {source_id: times for source_id, times in json.loads(str(cached['source_times']))}
+                    return aggregated_time, source_times, int(aggregated_time[0])
+            print("Input files or cache format changed since the aggregated timestamps were cached, recomputing")
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"Warning: Could not read {cache_file}, recomputing: {e}")
+
+    aggregated_time, source_times, begin_time = aggregate_timestamps_and_find_stream_durations(byte_list, socket_path)
+    np.savez(cache_file,
+             signature=np.array(signature),
+             aggregated_time=aggregated_time,
+             source_times=np.array(json.dumps(list(source_times.items()))))
+
+    return aggregated_time, source_times, begin_time
+
+
+def _read_byte_count_cache(cache_file):
+    """
+    Read byte_count.npz, written by run_normalization_driver.
+
+    Returns:
+        dict: 'byte_count' (ByteCount arrays), 'signature' (input file signature, as JSON) and 'byte_count_mtime'
+              (modification time of the byte_count.json the arrays match), or None if the file is missing or unreadable
+    """
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file) as cached:
+            return {
+                'byte_count': ByteCount(cached['times'], cached['sums'], cached['counts']),
+                'signature': str(cached['signature']),
+                'byte_count_mtime': float(cached['byte_count_mtime'])
+            }
+    except (OSError, ValueError, KeyError) as e:
+        # Includes caches written before the signature was stored, which are recomputed
+        print(f"Warning: Could not read {cache_file}, ignoring it: {e}")
+        return None
+
+
+def _byte_count_dict(byte_count_np):
+    # {timestamp: [total_bytecount, number_of_flows_contributing]}, the byte_count layout the rest of the pipeline passes around
+    return {timestamp: [total_bytes, num_flows] for timestamp, total_bytes, num_flows
+            in zip(byte_count_np.times.tolist(), byte_count_np.sums.tolist(), byte_count_np.counts.tolist())}
+
+
 def run_normalization_driver(base_path, stats_accumulator, socket_file=None):
     print("Normalizing Data", "=" * 60)
 
@@ -30,28 +115,55 @@ def run_normalization_driver(base_path, stats_accumulator, socket_file=None):
     # Step 2: Aggregate timestamps
     print("\nAggregating timestamps")
     socket_path = socket_file or os.path.join(base_path, "socketIds.json")
-    aggregated_time, source_times, begin_time = aggregate_timestamps_and_find_stream_durations(byte_list, socket_path)
+    aggregated_time, source_times, begin_time = _load_or_aggregate_timestamps(
+        byte_list, socket_path, base_path, [byte_file, current_file, latency_file])
     print(f"Aggregated {len(aggregated_time)} unique timestamps")
     stats_accumulator.add('num_timestamps', len(aggregated_time))
 
     # Step 3: Sum bytecounts across HTTP streams
     print("\nSumming bytecounts across HTTP streams")
     byte_count_file = os.path.join(base_path, "byte_count.json")
+    byte_count_cache = os.path.join(base_path, "byte_count.npz")
+
+    # The arrays are only used if they were computed from the current input files and still match byte_count.json
+    # (deleting byte_count.json forces a recompute, as before the arrays were cached)
+    signature = json.dumps(_input_file_signature([byte_file, current_file, latency_file, socket_path]))
+    cached = _read_byte_count_cache(byte_count_cache)
+    inputs_changed = cached is not None and cached['signature'] != signature
+    byte_count_mtime = os.path.getmtime(byte_count_file) if os.path.exists(byte_count_file) else None
 
-    if os.path.exists(byte_count_file):
-        print(f"Loading cached byte_count file")
-        byte_count_raw = utilities.load_json(byte_count_file)
-        byte_count = {int(ts): val for ts, val in byte_count_raw.items()}
+    if cached is not None and not inputs_changed and cached['byte_count_mtime'] == byte_count_mtime:
+        print("Loading cached byte_count arrays")
+        byte_count_np = cached['byte_count']
+        byte_count = _byte_count_dict(byte_count_np)
     else:
-        print(f"No cached byte_count file found, calculating from byte_list")
-        byte_count = sum_all_bytecounts_across_http_streams(byte_list, aggregated_time)
-        with open(byte_count_file, 'w') as f:
-            json.dump(byte_count, f, indent=4)
-        print(f"Calculated and saved byte_count")
+        if inputs_changed:
+            print("Input files changed since byte_count was cached, recomputing")
+
+        if byte_count_mtime is not None and not inputs_changed:
+            print("Loading cached byte_count file")
+            byte_count_raw = utilities.load_json(byte_count_file)
+            byte_count = {int(ts): val for ts, val in byte_count_raw.items()}
+            byte_count_np = byte_count_arrays(byte_count)
+        else:
+            if not inputs_changed:
+                print("No cached byte_count file found, calculating from byte_list")
+            # The sums come straight out as the arrays shared by the throughput calculations, and the dict is built from them
+            byte_count_np = sum_all_bytecounts_across_http_streams(byte_list, aggregated_time, as_arrays=True)
+            byte_count = _byte_count_dict(byte_count_np)
+            # byte_count.json is still written for the standalone plotting, slow start and artifact scripts
+            with open(byte_count_file, 'w') as f:
+                json.dump(byte_count, f, indent=4)
+            print("Calculated and saved byte_count")
+
+        # The arrays are cached as a compressed .npz, which reloads much faster than parsing byte_count.json, along with
+        # the input signature and the byte_count.json modification time they were built for
+        np.savez_compressed(byte_count_cache, times=byte_count_np.times, sums=byte_count_np.sums, counts=byte_count_np.counts,
+                            signature=np.array(signature), byte_count_mtime=np.float64(os.path.getmtime(byte_count_file)))
 
     # Validation statistics
     validation_stats = byte_count_validation(byte_list, byte_count)
-    num_flows = max(byte_count[timestamp][1] for timestamp in byte_count)
+    num_flows = int(byte_count_np.counts.max())
     stats_accumulator.add('total_raw_bytes', validation_stats['total_raw_bytes'])
     stats_accumulator.add('total_processed_bytes', validation_stats['total_processed_bytes'])
     stats_accumulator.add('first_timestamp', validation_stats['first_timestamp'])
@@ -70,5 +182,6 @@ def run_normalization_driver(base_path, stats_accumulator, socket_file=None):
         'source_times': source_times,
         'begin_time': begin_time,
         'byte_count': byte_count,
+        'byte_count_arrays': byte_count_np,
         'stats_accumulator': stats_accumulator
     }
\ No newline at end of file
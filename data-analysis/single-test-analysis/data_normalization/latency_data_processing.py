@@ -1,3 +1,5 @@
+import numpy as np
+
 def extract_latencies(latency_list):
     """
     Extract latency values from latency data structure.
@@ -6,7 +8,7 @@ def extract_latencies(latency_list):
         latency_list (list): List of latency entries with send_time and recv_time
 
     Returns:
-        list: List of latency values in milliseconds
+        np.ndarray: Latency values in milliseconds (float64), so callers can use .mean(), .std(), np.percentile, etc.
     """
     latencies = []
     for entry in latency_list:
@@ -27,4 +29,4 @@ def extract_latencies(latency_list):
                 latencies.append(entry['recv_time'][0])
             else:
                 latencies.append(entry['recv_time'])
-    return latencies
\ No newline at end of file
+    return np.asarray(latencies, dtype=np.float64)
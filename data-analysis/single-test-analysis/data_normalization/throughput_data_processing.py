@@ -4,12 +4,36 @@ The functions for preparing the data are:
 
 2) aggregate_timestamps_and_find_stream_durations: aggregates the timestamps from all sources and finds the start and end times for each HTTP stream. It also finds the socket that each stream uses if socket_file is available.
 
-3) sum_bytecounts_for_timestamps: Finds the proportion of byte counts for each interval, and how many flows are contributing at each byte count
+3) sum_all_bytecounts_across_http_streams: Finds the proportion of byte counts for each interval, and how many flows are contributing at each byte count
+
+4) byte_count_arrays: Lays byte_count out as parallel NumPy arrays (times, sums, counts) for the array-based calculations
+
+5) stream_arrays: The (times, bytecounts) int64 arrays of one HTTP stream's progress, stored on the entry by normalize_test_data
 """
 import utilities
 import os
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+import numpy as np
+
+# byte_count as a Structure of Arrays: times[i] has sums[i] bytes from counts[i] contributing flows
+ByteCount = namedtuple('ByteCount', 'times sums counts')
+
+_get_time = itemgetter('time')
+_get_bytecount = itemgetter('bytecount')
+_get_current_position = itemgetter('current_position')
 
 #------------------------------------Data Normalization------------------------------------------------
+@lru_cache(maxsize=8)
+def _load_latency_data(latency_file, modified_time):
+    # The latency file is only read once per (path, modification time), so re-running the normalization on the same
+    # test (ex: from a comparison script) skips reopening it, and editing the file invalidates the cached copy. Only the
+    # most recent files are kept, so comparing many tests does not hold every latency file in memory.
+    # The same dict is returned to every caller, so it must be treated as read-only
+    return utilities.load_json(latency_file)
+
 def normalize_test_data(byte_file, current_file, latency_file):
     # Load byte list first to determine test type
     byte_list = utilities.load_json(byte_file)
@@ -25,31 +49,30 @@ def normalize_test_data(byte_file, current_file, latency_file):
         # upload tests record the cumulative byte counts, so convert to incremental byte counts (ex: 16k, 32k and 48k bytes will be reported, but only 16k, 16k, and 16k bytes were actually transferred)
         byte_list = []
         for item in current_list:
-            new_progress = []
-            prev_position = 0  # Initialize the previous position
-
-            for progress in item["progress"]:
-                current_position = progress["current_position"]
-                time = progress["time"]
+            # Take the cumulative entries out of current_list so each stream's originals are freed once it is converted,
+            # instead of holding both full lists in memory until the end of the conversion
+            cumulative_progress = item.pop("progress")
+            times = np.fromiter(map(_get_time, cumulative_progress), dtype=np.int64, count=len(cumulative_progress))
+            positions = np.fromiter(map(_get_current_position, cumulative_progress), dtype=np.int64, count=len(cumulative_progress))
 
-                # Difference between positions is the number of bytes transferred
-                bytes_transferred = current_position - prev_position
-                prev_position = current_position  # Update previous position
+            # Difference between positions is the number of bytes transferred (the position starts at 0)
+            bytecounts = np.diff(positions, prepend=0)
 
-                # Add the incremental data to the new progress list
-                new_progress.append({"bytecount": bytes_transferred, "time": time})
-
-            # Append the transformed item to the uncumulated list
+            # Append the transformed item to the uncumulated list. Its arrays are built here already, so stream_arrays
+            # does not convert the new progress list again
             byte_list.append({
                 "id": item["id"],
                 "type": item["type"],
-                "progress": new_progress
+                "progress": [{"bytecount": bytes_transferred, "time": time}
+                             for bytes_transferred, time in zip(bytecounts.tolist(), map(_get_time, cumulative_progress))],
+                "times": times,
+                "bytecounts": bytecounts
             })
     else:  # For download test
         test_type = "download"
         # Load the latency file only if it exists (unloaded latency is optional, but needed to set the start time for the range)
         if os.path.exists(latency_file):
-            latency_data = utilities.load_json(latency_file)
+            latency_data = _load_latency_data(latency_file, os.path.getmtime(latency_file))
             print("Latency loaded")
 
             # Handle new nested structure or old flat structure
@@ -73,8 +96,32 @@ def normalize_test_data(byte_file, current_file, latency_file):
             print("No unloaded latency file found - throughput calculation will not include unloaded latency timing")
             print("Only loaded latency (if available) will be used for plotting")
 
+    # Convert every stream's progress to int64 arrays once, here, so the later steps read native ints instead of
+    # calling int() on each progress dict again
+    for entry in byte_list:
+        stream_arrays(entry)
+
     print("Length of byte_list after normalization:", len(byte_list))
     return byte_list, test_type
+
+
+def stream_arrays(entry):
+    """
+    Get a stream's progress as parallel int64 arrays. normalize_test_data stores them on each entry ('times' and
+    'bytecounts') after its last change to the progress lists; lists that did not go through it are converted here.
+
+    Args:
+        entry (dict): One stream of byte_list, with 'progress' entries holding 'time' and 'bytecount'
+
+    Returns:
+        tuple: (times, bytecounts) arrays, in progress order
+    """
+    if 'times' not in entry:
+        # fromiter converts the values like int() does, and mapping itemgetter avoids a Python-level call per event
+        progress = entry['progress']
+        entry['times'] = np.fromiter(map(_get_time, progress), dtype=np.int64, count=len(progress))
+        entry['bytecounts'] = np.fromiter(map(_get_bytecount, progress), dtype=np.int64, count=len(progress))
+    return entry['times'], entry['bytecounts']
 #-----------------------------------Timestamp Aggregation---------------------------------------------
 def aggregate_timestamps_and_find_stream_durations(byte_list, socket_file):
     """
@@ -87,26 +134,29 @@ def aggregate_timestamps_and_find_stream_durations(byte_list, socket_file):
     3. Finds the socket each source uses if socket_file is available
 
     """
-    aggregated_time = []
     source_times = {}
 
     # Step 1: Extract timestamps and source timing information
-    for entry in byte_list:  # For every source ID...
-        progress = entry['progress']
-        source_id = entry['id']
-
-        # Find the "begin" and "end" time for each source (first and last timestamps that have a bytecount)
-        if progress:
-            source_times[source_id] = {
-                'times': [int(progress[0]['time']), int(progress[-1]['time'])],
+    # Every event time of every source goes into one int64 array, each source's events being one contiguous segment
+    sources = [entry for entry in byte_list if entry['progress']]
+    lengths = np.fromiter((len(entry['progress']) for entry in sources), dtype=np.int64, count=len(sources))
+    event_times = np.concatenate([stream_arrays(entry)[0] for entry in sources] + [np.zeros(0, dtype=np.int64)])
+
+    # Find the "begin" and "end" time for each source (first and last timestamps that have a bytecount), read for every
+    # source at once from the first and last positions of its segment
+    if len(sources) > 0:
+        segment_ends = np.cumsum(lengths)
+        begin_times = event_times[segment_ends - lengths].tolist()
+        end_times = event_times[segment_ends - 1].tolist()
+        for entry, begin, end in zip(sources, begin_times, end_times):
+            source_times[entry['id']] = {
+                'times': [begin, end],
                 'socket': None
             }
 
-            # Add  unique timestamps to aggregated_time
-            for item in progress:
-                timestamp = int(item['time'])
-                if timestamp not in aggregated_time:
-                    aggregated_time.append(timestamp)
+    # The unique timestamps across all sources, found in one sort of the event times instead of checking every
+    # timestamp against the list collected so far
+    aggregated_time = np.unique(event_times)
 
     #Find the socket that each source uses
     if os.path.exists(socket_file):
@@ -123,116 +173,139 @@ def aggregate_timestamps_and_find_stream_durations(byte_list, socket_file):
                             source_times[source_id]['socket'] = socket_id
             else:
                 # For backward capability where socketIds.txt is still used, parse as text file
-                with open(socket_file, 'r') as f:
-                    for line in f:
-                        try:
-                            source_id, _, socket_id = map(int, line.strip().split(','))
-                            if source_id in source_times:
-                                source_times[source_id]['socket'] = socket_id
-                        except (ValueError, IndexError):
-                            print(f"Warning: Invalid line in socket file: {line.strip()}")
+                _assign_sockets_from_text_file(socket_file, source_times)
         except Exception as e:
             print(f"Error processing socket file: {e}")
             # Fallback to text file parsing
-            with open(socket_file, 'r') as f:
-                for line in f:
-                    try:
-                        source_id, _, socket_id = map(int, line.strip().split(','))
-                        if source_id in source_times:
-                            source_times[source_id]['socket'] = socket_id
-                    except (ValueError, IndexError):
-                        print(f"Warning: Invalid line in socket file: {line.strip()}")
+            _assign_sockets_from_text_file(socket_file, source_times)
 
-    # Step 3: Sort timestamps and find the beginning time
-    aggregated_time.sort()
-    begin_time = aggregated_time[0]
+    # Step 3: Find the beginning time (np.unique already sorted the timestamps). The timestamps are kept as one int64
+    # array (8 bytes each, instead of a boxed Python int per timestamp) for the array-based steps that follow
+    begin_time = int(aggregated_time[0])
 
     print("Number of aggregated timestamps:", len(aggregated_time))
 
     return aggregated_time, source_times, begin_time
+
+
+def _assign_sockets_from_text_file(socket_file, source_times):
+    # socketIds.txt has one "source_id,_,socket_id" line per source. The whole file is parsed in one np.loadtxt call
+    try:
+        socket_pairs = np.loadtxt(socket_file, delimiter=',', dtype=np.int64, usecols=(0, 2), ndmin=2)
+    except (ValueError, IndexError):
+        socket_pairs = None
+
+    if socket_pairs is not None:
+        for source_id, socket_id in socket_pairs.tolist():
+            if source_id in source_times:
+                source_times[source_id]['socket'] = socket_id
+        return
+
+    # Some line is malformed: go line by line, so the invalid lines are reported and the valid ones are still used
+    with open(socket_file, 'r') as f:
+        for line in f:
+            try:
+                source_id, _, socket_id = map(int, line.strip().split(','))
+                if source_id in source_times:
+                    source_times[source_id]['socket'] = socket_id
+            except (ValueError, IndexError):
+                print(f"Warning: Invalid line in socket file: {line.strip()}")
 #-----------------------------------Bytecount Summation---------------------------------------------
-def sum_all_bytecounts_across_http_streams(byte_list, aggregated_time):
+def sum_all_bytecounts_across_http_streams(byte_list, aggregated_time, as_arrays=False):
 
     """
     Sum byte counts for all unique timestamps across HTTP streams into one list.
     Each element in the resulting list looks like:
     timestamp: [total_bytecount, number_of_flows_contributing]
-    """
-    byte_count = {}
 
-    for timestamp in aggregated_time: # Initialize all bins
-        byte_count[timestamp] = [0, 0]
+    With as_arrays=True the sums are returned as a ByteCount, the layout the throughput calculations read, without
+    building the dict and converting it back with byte_count_arrays.
+    """
+    # Every timestamp of every stream is in aggregated_time, so each aggregated sub-interval (prev_time, current_time]
+    # lies inside exactly one interval of a stream it overlaps. The sub-intervals are filled with NumPy per stream,
+    # instead of scanning every stream interval for every aggregated sub-interval.
+    agg_times = np.asarray(aggregated_time, dtype=np.int64)
+    byte_sums = np.zeros(len(agg_times), dtype=np.int64)
+    # Each stream contributes a flow to one contiguous run of sub-intervals, so only the run boundaries are marked
+    # here (+1 where it starts, -1 after it ends) and the counts are a single cumulative sum at the end
+    flow_changes = np.zeros(len(agg_times) + 1, dtype=np.int64)
 
     for entry in byte_list: # For each HTTP stream:
         source_id = entry['id']
         progress = entry['progress']
+        if not progress:
+            continue
 
-        # Some http streams will have duplicate events with the same timestamp - this step will group them together into one event
-        stream_bytes = {}
-        for item in progress:
-            timestamp = int(item['time'])
-            bytecount = int(item['bytecount'])
-
-            if timestamp in stream_bytes:
-                stream_bytes[timestamp] += bytecount
-            else:
-                stream_bytes[timestamp] = bytecount
+        times, bytecounts = stream_arrays(entry)
 
-        # Since the stream_bytes is a dictionary, sort the timestamps
-        stream_timestamps = sorted(stream_bytes.keys())
+        # Some http streams will have duplicate events with the same timestamp - this step will group them together into one event
+        if np.all(times[1:] >= times[:-1]):
+            # Progress is recorded in time order, so duplicates are adjacent and no sort is needed
+            group_starts = np.flatnonzero(np.concatenate(([True], times[1:] != times[:-1])))
+            stream_timestamps = times[group_starts]
+            stream_bytes = np.add.reduceat(bytecounts, group_starts)
+        else:
+            stream_timestamps, inverse = np.unique(times, return_inverse=True)  # Sorted, like the dict keys before
+            stream_bytes = np.bincount(inverse, weights=bytecounts, minlength=len(stream_timestamps)).astype(np.int64)
 
         # check if first timestamp has non-zero bytes (missing initial zero-byte event)
-        first_timestamp = stream_timestamps[0]
-        if stream_bytes[first_timestamp] > 0:
-            print(f"Warning: Stream {source_id} - First timestamp ({first_timestamp}) has {stream_bytes[first_timestamp]} bytes.")
+        if stream_bytes[0] > 0:
+            print(f"Warning: Stream {source_id} - First timestamp ({stream_timestamps[0]}) has {stream_bytes[0]} bytes.")
             print(f"         These bytes will be dropped. Stream should start with a 0-byte event.")
             # Treat first timestamp as the "zero" baseline - drop its bytes and use it as interval start
             # dropping these bytes should have minimal impact on the overall throughput calculation
-            stream_bytes[first_timestamp] = 0
-
-        # After grouping duplicate timestamps together, distribute these bytes across the smaller sub-intervals of the aggregated timestamps
-        for i in range(1, len(aggregated_time)):
-            #specifiy the smallest interval of the aggregated timestamps
-            current_time = aggregated_time[i]
-            prev_time = aggregated_time[i-1]
-
-            for j in range(len(stream_timestamps) - 1): #  For each stream interval
-                #Look at the current interval of timestamps from the stream - this should be >= the intervals in aggregated_time
-                start_time = stream_timestamps[j]
-                end_time = stream_timestamps[j+1]
-
-                # Skip if this interval doesn't overlap with our time window
-                if end_time <= prev_time or start_time >= current_time:
-                    continue
-
-                interval_duration = end_time - start_time #calculate the interval from the HTTP Stream
-
-                # Handle zero-duration intervals (multiple events at same timestamp)
-                if interval_duration <= 0:
-                    # Zero-duration: attribute bytes directly to end_time without distribution
-                    if end_time in byte_count:
-                        byte_count[end_time][0] += stream_bytes[end_time]
-                        # Increment flow count if this is a new flow starting at this timestamp
-                        if j == 0 or (end_time > stream_timestamps[j-1]):
-                            byte_count[end_time][1] += 1
-                    continue  # Skip proportional distribution for zero-duration intervals
-
-                # Calculate overlap between the http stream interval and the current sub-interval
-                overlap_start = max(prev_time, start_time)
-                overlap_end = min(current_time, end_time)
-                proportion = (overlap_end - overlap_start) / interval_duration
-
-                # Calculate bytes to add to the sub-interval from the aggregated timestamps
-                # The bytes at end_time represent data received during [start_time → end_time]
-                bytes_to_add = int(stream_bytes[end_time] * proportion)
-
-                # Add bytes to the current timestamp entry
-                if current_time in byte_count:
-                    byte_count[current_time][0] += bytes_to_add
-
-                    # Increment the flow count at this timestamp
-                    if j == 0 or (prev_time > stream_timestamps[j-1]):
-                        byte_count[current_time][1] += 1
+            stream_bytes[0] = 0
+
+        if len(stream_timestamps) < 2:
+            continue
+
+        # Position of each stream timestamp in aggregated_time, and the aggregated sub-intervals the stream covers
+        positions = np.searchsorted(agg_times, stream_timestamps)
+        first, last = positions[0] + 1, positions[-1] + 1
+        covered = np.arange(first, last)
+        # Stream interval j holds sub-intervals (positions[j], positions[j+1]], so walking both sorted lists in step
+        # just repeats each interval index once per sub-interval it holds
+        stream_interval = np.repeat(np.arange(len(positions) - 1), np.diff(positions))
+
+        # The bytes at end_time represent data received during [start_time -> end_time], split by each sub-interval's share of it
+        interval_durations = np.diff(stream_timestamps)
+        proportions = (agg_times[covered] - agg_times[covered - 1]) / interval_durations[stream_interval]
+        byte_sums[first:last] += np.trunc(stream_bytes[stream_interval + 1] * proportions).astype(np.int64)
+
+        # Each covered sub-interval has this flow contributing
+        flow_changes[first] += 1
+        flow_changes[last] -= 1
+
+    flow_counts = np.cumsum(flow_changes[:-1])
+
+    if as_arrays:
+        print(f"Length of byte_count: {len(agg_times)}")
+        return ByteCount(agg_times, byte_sums, flow_counts)
+
+    byte_count = {timestamp: [total_bytes, num_flows]
+                  for timestamp, total_bytes, num_flows in zip(agg_times.tolist(), byte_sums.tolist(), flow_counts.tolist())}
 
     print(f"Length of byte_count: {len(byte_count)}")
     return byte_count
+
+
+def byte_count_arrays(byte_count):
+    """
+    Convert the {timestamp: [total_bytecount, number_of_flows_contributing]} dict into three aligned int64 arrays,
+    once, so later steps can use vectorized operations instead of looking up every timestamp in the dict.
+
+    Args:
+        byte_count (dict): Output of sum_all_bytecounts_across_http_streams (or the cached byte_count.json)
+
+    Returns:
+        ByteCount: (times, sums, counts) arrays, sorted by time
+    """
+    times = np.fromiter(byte_count.keys(), dtype=np.int64, count=len(byte_count))
+    values = np.fromiter(chain.from_iterable(byte_count.values()), dtype=np.int64, count=2 * len(byte_count)).reshape(-1, 2)
+
+    # byte_count is built in aggregated_time order, only sort if it was not
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind='stable')
+        times, values = times[order], values[order]
+
+    return ByteCount(times, values[:, 0], values[:, 1])
@@ -7,6 +7,8 @@ sum_bytecounts_and_find_time_proportions: Used for finding the frequencies that
 
 import numpy as np
 import json
+from collections import defaultdict
+from .throughput_data_processing import stream_arrays
 
 def byte_count_validation(byte_list, byte_count):
     #1: calculate the raw bytes collected from the test, as well as the duration of the test
@@ -14,10 +16,11 @@ def byte_count_validation(byte_list, byte_count):
     first_timestamp = float('inf')
     last_timestamp = -1
     for entry in byte_list:
-        for progress in entry['progress']:
-            total_raw_bytes += int(progress['bytecount'])
-            first_timestamp = min([int(progress['time']), first_timestamp])
-            last_timestamp = max([int(progress['time']), last_timestamp])
+        if entry['progress']:
+            times, bytecounts = stream_arrays(entry)
+            total_raw_bytes += int(bytecounts.sum())
+            first_timestamp = min(int(times.min()), first_timestamp)
+            last_timestamp = max(int(times.max()), last_timestamp)
 
 
     duration_ms = last_timestamp - first_timestamp
@@ -38,12 +41,10 @@ def byte_count_validation(byte_list, byte_count):
     #using the byte_list, loop through the each entry. For each entry, only add the bytecounts if the previous timestamp was different than the last one
     unique_timestamp_bytes = 0
     for entry in byte_list:
-        previous_time = None
-        for progress in entry['progress']:
-            current_time = int(progress['time'])
-            if current_time != previous_time:
-                unique_timestamp_bytes += int(progress['bytecount'])
-                previous_time = current_time
+        times, bytecounts = stream_arrays(entry)
+        if len(times) > 0:
+            new_time = np.concatenate(([True], times[1:] != times[:-1]))
+            unique_timestamp_bytes += int(bytecounts[new_time].sum())
 
     #pretty print results: table of bytecount and duration comparison between raw and processed
     print(f"{'Metric':<30} | {'Value':<20}")
@@ -155,88 +156,97 @@ def sum_bytecounts_and_find_time_proportions(byte_list, aggregated_time):
     """
     Used for finding the frequencies that the time proportion evalues to.
     """
-    byte_count = {}
+    # [bytes, count] per timestamp, created on first use
+    byte_count = defaultdict(lambda: [0.0, 0])
 
-    # Track proportion statistics
-    proportion_stats = {
-        "total": 0,
-        "exact_1": 0,
-        "between_0_1": 0,
-        "other": 0,
-        "distribution": {}
-    }
+    # Every proportion is collected here, and the statistics are computed from the whole array after the loop
+    proportions = []
 
     for entry in byte_list:  # For each http stream
         end_time = -1
         start_time = -1
 
+        # The stream's times and byte counts are converted to ints once here, instead of once per aggregated timestamp
+        times, bytecounts = stream_arrays(entry)
+        progress = list(zip(times.tolist(), bytecounts.tolist()))
+
         for i in range(1, len(aggregated_time)):  # Loop through entire aggregated_time list
             current_list_time = aggregated_time[i]
             prev_list_time = aggregated_time[i-1]
 
-            progress = entry['progress']
-            for item in progress:
+            for item_time, item_bytecount in progress:
                 if (end_time != -1 and start_time != -1):
                     break
 
-                if ((int(item['time']) > prev_list_time) and start_time == -1):
+                if ((item_time > prev_list_time) and start_time == -1):
                     break
 
-                if (int(item['time']) <= prev_list_time):
-                    start_time = int(item['time'])
+                if (item_time <= prev_list_time):
+                    start_time = item_time
 
-                elif (int(item['time']) >= current_list_time):
-                    end_time = int(item['time'])
+                elif (item_time >= current_list_time):
+                    end_time = item_time
 
                 if (end_time != -1):
                     # Calculate proportion of bytes for this time interval
                     time_span = end_time - start_time
                     if time_span > 0:  # Avoid division by zero error
-                        proportion = (current_list_time - prev_list_time) / time_span
-
-                        # Track proportion statistics
-                        proportion_stats["total"] += 1
-                        rounded_prop = round(proportion, 2)  # Round to 2 decimal places for binning
-
-                        if rounded_prop in proportion_stats["distribution"]:
-                            proportion_stats["distribution"][rounded_prop] += 1
-                        else:
-                            proportion_stats["distribution"][rounded_prop] = 1
-
-                        # Categorize the proportion
-                        if rounded_prop == 1.0:
-                            proportion_stats["exact_1"] += 1
-                        elif 0 < proportion < 1:
-                            proportion_stats["between_0_1"] += 1
+                        interval_span = current_list_time - prev_list_time
+                        if interval_span == time_span:
+                            # The interval is the whole stream interval (the most common case), so all of its bytes are added
+                            proportion = 1.0
+                            bytes_to_add = item_bytecount
                         else:
-                            proportion_stats["other"] += 1
-
-                        # Calculate bytes to add based on proportion
-                        bytes_to_add = int(item['bytecount']) * proportion
+                            proportion = interval_span / time_span
+                            # Calculate bytes to add based on proportion
+                            bytes_to_add = item_bytecount * proportion
+                        proportions.append(proportion)
 
                         # Add to byte_count
-                        if current_list_time in byte_count:
-                            byte_count[current_list_time][0] += bytes_to_add
-                            byte_count[current_list_time][1] += 1
-                        else:
-                            byte_count[current_list_time] = [bytes_to_add, 1]
+                        count_entry = byte_count[current_list_time]
+                        count_entry[0] += bytes_to_add
+                        count_entry[1] += 1
 
             # Reset start and end time for each event
             start_time = -1
             end_time = -1
 
+    # Track proportion statistics
+    # Round to 2 decimal places for binning. Python's round is used, since np.round (scale, round, unscale) lands on
+    # the other side of some halfway values (ex: 1.775 -> 1.78 instead of 1.77)
+    rounded_props = np.array([round(proportion, 2) for proportion in proportions], dtype=np.float64)
+    proportions = np.array(proportions, dtype=np.float64)
+
+    # Categorize the proportions
+    exact_1_mask = rounded_props == 1.0
+    between_0_1_mask = ~exact_1_mask & (proportions > 0) & (proportions < 1)
+    exact_1 = int(np.count_nonzero(exact_1_mask))
+    between_0_1 = int(np.count_nonzero(between_0_1_mask))
+
+    # Bin the rounded proportions into their frequencies, in order of first occurrence
+    bins, first_seen, frequencies = np.unique(rounded_props, return_index=True, return_counts=True)
+    first_seen_order = np.argsort(first_seen)
+    bins, frequencies = bins[first_seen_order], frequencies[first_seen_order]
+
+    proportion_stats = {
+        "total": int(proportions.size),
+        "exact_1": exact_1,
+        "between_0_1": between_0_1,
+        "other": int(proportions.size) - exact_1 - between_0_1,
+        "distribution": dict(zip(bins.tolist(), frequencies.tolist()))
+    }
+
     # Calculate percentages if we have any proportions
     if proportion_stats["total"] > 0:
         proportion_stats["percent_exact_1"] = (proportion_stats["exact_1"] / proportion_stats["total"]) * 100
         proportion_stats["percent_between_0_1"] = (proportion_stats["between_0_1"] / proportion_stats["total"]) * 100
         proportion_stats["percent_other"] = (proportion_stats["other"] / proportion_stats["total"]) * 100
 
-    # Add the most common proportions
-    sorted_distribution = sorted(proportion_stats["distribution"].items(),
-                                key=lambda x: x[1], reverse=True)
-    proportion_stats["most_common"] = sorted_distribution[:10] if sorted_distribution else []
+    # Add the most common proportions (ties keep their order of first occurrence)
+    most_common = np.argsort(-frequencies, kind='stable')[:10]
+    proportion_stats["most_common"] = list(zip(bins[most_common].tolist(), frequencies[most_common].tolist()))
 
-    return byte_count, proportion_stats
+    return dict(byte_count), proportion_stats
 
 #Throughput validation functions
 def print_throughput_entries(throughput_results, num_entries):
@@ -297,13 +307,13 @@ def throughput_mean_median_range(throughput_results):
         print("No throughput data available for analysis")
         return
 
-    throughput_values = [result['throughput'] for result in throughput_results]
+    throughput_values = np.fromiter((result['throughput'] for result in throughput_results), dtype=np.float64, count=len(throughput_results))
 
     num_points = len(throughput_values)
-    mean_throughput = sum(throughput_values) / len(throughput_values)
+    mean_throughput = float(throughput_values.mean())
     median_throughput = np.median(throughput_values)
-    min_throughput = min(throughput_values)
-    max_throughput = max(throughput_values)
+    min_throughput = float(throughput_values.min())
+    max_throughput = float(throughput_values.max())
     throughput_range = max_throughput - min_throughput
 
     print("\nThroughput Statistics:")
@@ -12,18 +12,13 @@ I kept the old code, but it is very messy and should be refactored.
 """
 
 from pathlib import Path
-import pandas as pd
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
 import argparse
-from sklearn.cluster import KMeans
-from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
-from sklearn.neighbors import NearestNeighbors
 import sys
-from kneed import KneeLocator
+
+# pandas, matplotlib, scikit-learn and kneed are imported inside the functions that use them, so importing this
+# module (main.py always does) costs nothing when artifact filtering is turned off
 
 import dimension_throughput_calc as tp_calc
 
@@ -71,6 +66,7 @@ def run_throughput_artifact_filter(config_accumulator, throughput_results, artif
         config_accumulator.add(f'{throughput_method}_percent_time_removed_by_filtering', 0.0)
         return throughput_results
 
+    import pandas as pd
     df = pd.DataFrame(throughput_results)
     suffix = plot_suffix
     threshold = 1000
@@ -213,6 +209,9 @@ def run_dbscan_driver_bytecount(folder: str, dbscan_option: bool, byte_count, co
     return result
 
 def estimate_eps_kneedle(X, dim=2):
+    from sklearn.neighbors import NearestNeighbors
+    from kneed import KneeLocator
+
     minPts = 2 * dim
     k = minPts - 1
 
@@ -234,6 +233,9 @@ def detect_artifacts_dbscan(df, folder=None, suffix=""):
     DBSCAN-based artifact detection in (time, byte_transferred) space.
     Noise points (label = -1) are considered artifacts.
     """
+    from sklearn.cluster import DBSCAN
+    from sklearn.preprocessing import StandardScaler
+
     X = df[["time", "throughput"]].values
     X = StandardScaler().fit_transform(X)
     eps, min_samples = estimate_eps_kneedle(X, dim=2)
@@ -275,6 +277,7 @@ def load_bytecount_json(folder: str):
         raw = json.load(f)     # original stays untouched
 
     # Build dataframe
+    import pandas as pd
     df = (
         pd.DataFrame.from_dict(
             raw,
@@ -312,6 +315,8 @@ def plot_knn_distance(
     folder : optional str, folder to save plot
     suffix : str, suffix for filename
     """
+    import matplotlib.pyplot as plt
+    from sklearn.neighbors import NearestNeighbors
 
     minPts = 2 * dim
     k = minPts - 1
@@ -337,19 +342,22 @@ def plot_knn_distance(
     else:
         plt.title(f"{k}-NN distance plot (minPts={minPts})")
 
-    plt.tight_layout()
-
     if folder is not None:
         out = Path(folder) / "plot_images"
         out.mkdir(exist_ok=True)
         out_file = out / f"knn{suffix}.png"
+        # bbox_inches="tight" already trims the saved image, so the layout solver is only needed on screen
         plt.savefig(out_file, dpi=300, bbox_inches="tight")
         plt.close()
     else:
+        plt.tight_layout()
         plt.show()
 
 
 def plot_dbscan(folder, df, suffix=""):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     mask = df["dbscan_artifact"]
     t0 = df["time"].iloc[0]
     time_normalized = pd.to_numeric(df["time"]) - int(t0)
@@ -385,6 +393,9 @@ def plot_threshold(config_accumulator, folder, throughput_results, df, threshold
     """
     Only called by run_dbscan_throughput
     """
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     print("plotting threshold")
     t0 = df["time"].iloc[0]
     time_normalized = pd.to_numeric(df["time"]) - int(t0)
@@ -427,11 +438,12 @@ def plot_threshold(config_accumulator, folder, throughput_results, df, threshold
     plt.title(f"Throughput Over Time with Y Threshold ({pct_above:.1f}% above)")
     plt.legend()
     plt.grid()
-    plt.tight_layout()
 
     if folder is not None:
         out.mkdir(exist_ok=True)
+        # bbox_inches="tight" already trims the saved image, so the layout solver is only needed on screen
         plt.savefig(out_file, dpi=300, bbox_inches="tight")
         plt.close()
     else:
+        plt.tight_layout()
         plt.show()
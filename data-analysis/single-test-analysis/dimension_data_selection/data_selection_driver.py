@@ -1,7 +1,13 @@
-def run_data_selection_driver(byte_count, aggregated_time, stats_accumulator):
+import numpy as np
+import data_normalization as data_norm
+
+def run_data_selection_driver(byte_count, aggregated_time, stats_accumulator, byte_count_arrays=None):
     """
     Analyze data selection patterns: compute metrics for max flows vs non-max flows.
     All metrics are added to stats_accumulator as flat (non-nested) entries.
+
+    byte_count_arrays is the (times, sums, counts) layout of byte_count from the normalization driver, built here if
+    not given. The metrics are reductions over its masks instead of scans over the dict.
     """
     print("\n" + "=" * 60)
     print("Data selection driver")
@@ -9,34 +15,34 @@ def run_data_selection_driver(byte_count, aggregated_time, stats_accumulator):
     # Find maximum number of flows
     num_flows = stats_accumulator.get('num_sockets')
 
+    if byte_count_arrays is None:
+        byte_count_arrays = data_norm.byte_count_arrays(byte_count)
+    times, sums, counts = byte_count_arrays
+    aggregated_time = np.asarray(aggregated_time, dtype=np.int64)
+
     # === Compute Total Metrics ===
     total_points = len(byte_count)
-    total_bytes = sum(byte_count[ts][0] for ts in byte_count)
+    total_bytes = int(sums.sum())
 
-    if aggregated_time:
-        total_duration_ms = aggregated_time[-1] - aggregated_time[0]
+    if len(aggregated_time) > 0:
+        total_duration_ms = int(aggregated_time[-1] - aggregated_time[0])
     else:
         total_duration_ms = 0
 
     # === Compute Max Flow Metrics ===
+    max_flows_mask = counts == num_flows
+    max_flow_timestamps = times[max_flows_mask]
+
     # Count points where all flows are contributing
-    num_points_all_flows_contributing = sum(1 for ts in byte_count if byte_count[ts][1] == num_flows)
+    num_points_all_flows_contributing = int(np.count_nonzero(max_flows_mask))
 
     # Sum bytes where all flows are contributing
-    num_bytes_all_flows_contributing = sum(byte_count[ts][0] for ts in byte_count if byte_count[ts][1] == num_flows)
-    num_bytes_not_max_flows = sum(byte_count[ts][0] for ts in byte_count if byte_count[ts][1] != num_flows)
-
-    # Calculate time duration where all flows are contributing
-    if aggregated_time:
-        max_flow_timestamps = [ts for ts in byte_count if byte_count[ts][1] == num_flows]
-        if max_flow_timestamps:
-            time_all_flows_contributing = sum(
-                aggregated_time[i+1] - aggregated_time[i]
-                for i in range(len(aggregated_time)-1)
-                if aggregated_time[i] in max_flow_timestamps
-            )
-        else:
-            time_all_flows_contributing = 0
+    num_bytes_all_flows_contributing = int(sums[max_flows_mask].sum())
+
+    # Calculate time duration where all flows are contributing (each interval is credited to the timestamp it starts at)
+    if len(aggregated_time) > 0:
+        starts_with_max_flows = np.isin(aggregated_time[:-1], max_flow_timestamps)
+        time_all_flows_contributing = int(np.diff(aggregated_time)[starts_with_max_flows].sum())
     else:
         time_all_flows_contributing = 0
 
@@ -83,12 +89,8 @@ def run_data_selection_driver(byte_count, aggregated_time, stats_accumulator):
     })
 
     #Filter to Selected Data (Max Flows Only)
-    selected_byte_count = {
-        ts: byte_count[ts]
-        for ts in byte_count
-        if byte_count[ts][1] == num_flows
-    }
-    selected_aggregated_time = [ts for ts in aggregated_time if ts in selected_byte_count]
+    selected_byte_count = {ts: byte_count[ts] for ts in max_flow_timestamps.tolist()}
+    selected_aggregated_time = aggregated_time[np.isin(aggregated_time, max_flow_timestamps)].tolist()
 
     print(f"Selected {len(selected_byte_count)}/{total_points} points (max flows only)")
     print(f"Max flows contribute {percent_points_all_flows_contributing:.1f}% of points, {percent_bytes_all_flows_contributing:.1f}% of bytes, {percent_time_all_flows_contributing:.1f}% of time")
@@ -1,15 +1,15 @@
 import numpy as np
 import json
-import matplotlib.pyplot as plt
-from matplotlib.lines import Line2D
 import argparse
-import pandas as pd
 from pathlib import Path
 import sys
 
+# pandas and matplotlib are imported inside the functions that use them, so importing this module does not load them
+
 
 def run_slowstart_driver(folder: str, stats_accumulator, config_accumulator, byte_count=None):
     print(f"\n SLOW START FILTERING")
+    import pandas as pd
     if byte_count is not None:
         # Use the provided byte_count dict (already filtered by DBSCAN)
         df = (
@@ -61,6 +61,9 @@ def run_slowstart_driver(folder: str, stats_accumulator, config_accumulator, byt
 
 
 def plot_slowstart(folder, df, threshold):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     t0 = df["time"].iloc[0]
     threshold = pd.to_numeric(threshold) - int(t0)
     time_normalized = pd.to_numeric(df["time"]) - int(t0)
@@ -88,6 +91,7 @@ def load_bytecount_json(folder: str):
         raw = json.load(f)     # original stays untouched
 
     # Build dataframe
+    import pandas as pd
     df = (
         pd.DataFrame.from_dict(
             raw,
@@ -2,11 +2,13 @@ from .throughput_calculation import (
     calculate_traditional_throughput,
     calculate_interval_threshold_throughput,
     calculate_interval_threshold_throughput_tracking_discarded_data,
+    calculate_interval_threshold_throughput_by_flows,
     calculate_throughput_with_less_flows,
     calculate_throughput_separate_flows,
     calculate_accurate_throughput_with_smooth_plot,
     calculate_throughput_weighted_points,
-    calculate_throughput_strict_intervals
+    calculate_throughput_strict_intervals,
+    calculate_throughput_strict_intervals_by_flows
 )
 from .throughput_driver import run_throughput_calculation_driver
 from .throughput_metrics import compute_throughput_metrics
@@ -15,13 +17,15 @@ __all__ = [
     "calculate_traditional_throughput",
     "calculate_interval_threshold_throughput",
     "calculate_interval_threshold_throughput_tracking_discarded_data",
+    "calculate_interval_threshold_throughput_by_flows",
     "calculate_throughput_with_less_flows",
     "calculate_throughput_separate_flows",
     "calculate_accurate_throughput_with_smooth_plot",
     "calculate_throughput_weighted_points",
     "run_throughput_calculation_driver",
     "compute_throughput_metrics",
-    "calculate_throughput_strict_intervals"
+    "calculate_throughput_strict_intervals",
+    "calculate_throughput_strict_intervals_by_flows"
 ]
 
 __version__ = '1.0.0'
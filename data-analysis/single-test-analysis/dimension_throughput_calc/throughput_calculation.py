@@ -4,10 +4,213 @@ There are three methods of calculating throughput:
 
 2. Interval method: This method uses a threshold to determine the minimum time interval used in calculating the throughput. This is the current method of calculating throughput.
 If a data point has a time interval less than the threshold, it is combined with the next data point so that the time interval is greater than or equal to the threshold.
+    calculate_interval_threshold_throughput_by_flows runs this method for every flow count at once (used for plotting).
 
 3. Less flows method (used for testing only): This method calculates throughput for entries with num_flows and num_flows - 1, keeping them in separate lists.
     Both lists follow the same time interval threshold calculation technique as method #2.
 """
+from itertools import chain
+
+import numpy as np
+
+
+#-----------------------------------Flat Array Kernels---------------------------------------------
+def _byte_count_events(aggregated_time, byte_count):
+    """
+    Lay out the byte_count events (every aggregated timestamp after the first) as flat int64 arrays, converted once per call
+    so the throughput calculations below work on arrays instead of dict lookups.
+
+    byte_count is either the {timestamp: [bytes, flows]} dict or its (times, sums, counts) arrays from
+    data_normalization.byte_count_arrays, which are used as they are.
+
+    Returns:
+        tuple: (event_times, prev_times, event_bytes, event_flows, in_byte_count) arrays, one entry per event.
+               Timestamps missing from byte_count have 0 bytes, 0 flows and in_byte_count False.
+    """
+    times = np.asarray(aggregated_time, dtype=np.int64)
+    num_events = max(len(times) - 1, 0)
+
+    if not isinstance(byte_count, dict):
+        count_times, count_sums, count_flows = byte_count
+        if np.array_equal(count_times, times):
+            return times[1:], times[:-1], count_sums[1:], count_flows[1:], np.ones(num_events, dtype=bool)
+
+        # Match each event to its byte_count entry (count_times is sorted), with a sentinel entry for missing timestamps
+        positions = np.searchsorted(count_times, times[1:])
+        in_byte_count = positions < len(count_times)
+        in_byte_count[in_byte_count] = count_times[positions[in_byte_count]] == times[1:][in_byte_count]
+        positions[~in_byte_count] = len(count_times)
+        event_bytes = np.append(count_sums, 0)[positions]
+        event_flows = np.append(count_flows, 0)[positions]
+        return times[1:], times[:-1], event_bytes, event_flows, in_byte_count
+
+    if len(byte_count) == len(times) and np.array_equal(np.fromiter(byte_count.keys(), dtype=np.int64, count=len(byte_count)), times):
+        # byte_count is built with one entry per aggregated timestamp, in order - read its values straight into an array
+        counts = np.fromiter(chain.from_iterable(byte_count.values()), dtype=np.int64, count=2 * len(byte_count)).reshape(-1, 2)[1:]
+        return times[1:], times[:-1], counts[:, 0], counts[:, 1], np.ones(num_events, dtype=bool)
+
+    counts = [byte_count.get(timestamp) for timestamp in aggregated_time[1:]]
+    in_byte_count = np.fromiter((count is not None for count in counts), dtype=bool, count=num_events)
+    event_bytes = np.fromiter((count[0] if count is not None else 0 for count in counts), dtype=np.int64, count=num_events)
+    event_flows = np.fromiter((count[1] if count is not None else 0 for count in counts), dtype=np.int64, count=num_events)
+    return times[1:], times[:-1], event_bytes, event_flows, in_byte_count
+
+
+def _positional_events(aggregated_time, byte_count, num_flows):
+    """
+    The byte_count events as plain lists indexed by position (event i ends at aggregated_time[i + 1]), for the
+    calculations that still walk the events one by one: the flow count is checked in a list instead of looking every
+    timestamp up in byte_count.
+
+    Returns:
+        tuple: (event_times, prev_times, event_bytes, has_num_flows) lists, one entry per event
+    """
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    has_num_flows = in_byte_count & (event_flows == num_flows)
+    return event_times.tolist(), prev_times.tolist(), event_bytes.tolist(), has_num_flows.tolist()
+
+
+def _threshold_intervals(event_times, prev_times, valid, interval_threshold, run_keys=None):
+    """
+    Split each run of consecutive valid events into intervals of at least interval_threshold ms, greedily from the
+    start of the run (the accumulate-until-threshold-then-reset loop of the interval methods), without a per-event loop.
+    If run_keys is given, a run also ends where the key changes, so several independent calculations (one per key)
+    are done in the same pass.
+
+    The events are contiguous in time, so the time accumulated from event s through event k is event_times[k] - prev_times[s],
+    and the event that closes an interval started at s is found for every s at once with one searchsorted.
+    Each interval start then points to the next one, and the starts actually reached from the run starts are found by
+    pointer doubling (log2 of the longest chain of intervals passes over the arrays).
+
+    Returns:
+        tuple: (interval_starts, interval_ends, leftover_starts, leftover_ends) index arrays. Interval i covers events
+               interval_starts[i]..interval_ends[i] (inclusive). Leftovers are the events at the end of each run that
+               never reached the threshold, covering leftover_starts[j]..leftover_ends[j] - 1.
+    """
+    num_events = len(event_times)
+    event_idx = np.arange(num_events)
+
+    # First event k >= s whose accumulated time from s reaches the threshold
+    closing_event = np.maximum(np.searchsorted(event_times, prev_times + interval_threshold, side='left'), event_idx)
+
+    # Where the run containing each event ends (the next invalid event, or the end of the data), and where each run starts
+    if run_keys is None:
+        run_end = np.minimum.accumulate(np.where(valid, num_events, event_idx)[::-1])[::-1]
+        run_starts = np.flatnonzero(valid & ~np.concatenate(([False], valid[:-1])))
+    else:
+        new_run = valid & ~np.concatenate(([False], valid[:-1] & (run_keys[:-1] == run_keys[1:])))
+        stops = np.append(np.where(~valid | new_run, event_idx, num_events)[1:], num_events)
+        run_end = np.where(valid, np.minimum.accumulate(stops[::-1])[::-1], event_idx)
+        run_starts = np.flatnonzero(new_run)
+
+    # An interval started at s closes inside its run, and the next interval starts right after it (if still inside the run).
+    # Index num_events is a sink for "no next interval".
+    closes_in_run = closing_event < run_end
+    next_start = np.where(closes_in_run & (closing_event + 1 < run_end), closing_event + 1, num_events)
+
+    # Mark every interval start reachable from a run start: after k passes, jump holds the start 2^k intervals ahead
+    is_start = np.zeros(num_events + 1, dtype=bool)
+    is_start[run_starts] = True
+    jump = np.append(next_start, num_events)
+    while (jump[:-1] < num_events).any():
+        is_start[jump[np.flatnonzero(is_start)]] = True
+        jump = jump[jump]
+
+    starts = np.flatnonzero(is_start[:-1])
+    closed = closes_in_run[starts]
+    return starts[closed], closing_event[starts[closed]], starts[~closed], run_end[starts[~closed]]
+
+
+def _interval_throughput_results(event_times, prev_times, event_bytes, interval_starts, interval_ends, begin_time):
+    # Throughput points for the intervals from _threshold_intervals, with the same arithmetic as the scalar loops
+    bytes_prefix = np.concatenate(([0], np.cumsum(event_bytes)))
+    accumulated_bytes = bytes_prefix[interval_ends + 1] - bytes_prefix[interval_starts]
+    accumulated_time = event_times[interval_ends] - prev_times[interval_starts]
+
+    throughput = (accumulated_bytes / accumulated_time) * 1000  # conversion to bytes/second
+    times_sec = (prev_times[interval_starts] - begin_time) / 1000  # time since start in seconds
+    throughput_mbps = throughput * (8/1000000)  # conversion to Mbps
+
+    return [{'time': time_sec, 'throughput': tp} for time_sec, tp in zip(times_sec.tolist(), throughput_mbps.tolist())]
+
+
+def _strict_intervals(event_times, prev_times, event_bytes, valid, sampling_period, run_keys=None):
+    """
+    The strict interval (sampling period) loop over runs of consecutive valid events, without a per-event loop.
+    If run_keys is given, a run also ends where the key changes (one independent calculation per key in the same pass).
+
+    Within a run the accumulated time is just the run's cumulative time, so the number of periods each event completes
+    and the time left over are found with integer division. Completing periods keeps the bytes/time rate of the
+    accumulation and scales the leftover bytes by leftover_time / accumulated_time, so the leftover bytes follow
+    x[k] = c[k] * (x[k-1] + bytes[k]). That recurrence is solved for every event at once with a prefix scan over
+    the affine maps (log2 of the number of events passes), invalid events resetting it to 0.
+
+    Returns:
+        tuple: (period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, run_ends, run_leftovers)
+               Event k completes the periods period_indices[k] onwards of its run (period_events[k] of them), with
+               accumulated_bytes[k] over accumulated_time[k] ms before they are taken out. Run r covers events
+               run_starts[r]..run_ends[r] - 1 and run_leftovers[r] bytes were still accumulated at its end.
+    """
+    num_events = len(event_times)
+    time_diffs = event_times - prev_times
+
+    # Cumulative time inside each run
+    continues_run = valid[:-1] & valid[1:]
+    if run_keys is not None:
+        continues_run &= run_keys[:-1] == run_keys[1:]
+    new_run = valid & ~np.concatenate(([False], continues_run))
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.flatnonzero(valid & ~np.append(continues_run, False)) + 1
+    run_time = np.cumsum(np.where(valid, time_diffs, 0))
+    run_base = np.zeros(num_events, dtype=run_time.dtype)
+    run_base[run_starts] = run_time[run_starts] - time_diffs[run_starts]
+    run_time = run_time - np.maximum.accumulate(run_base)
+
+    # Periods completed by each event, and the time accumulated before/after taking them out
+    prev_run_time = run_time - time_diffs
+    period_indices = prev_run_time // sampling_period
+    period_events = np.where(valid, run_time // sampling_period - period_indices, 0)
+    accumulated_time = prev_run_time - period_indices * sampling_period + time_diffs
+    leftover_time = accumulated_time - period_events * sampling_period
+
+    # Leftover bytes: x -> scale * (x + bytes), with scale 0 for invalid events (the accumulation is reset)
+    scale = np.where(valid, np.where(period_events > 0, leftover_time / np.where(accumulated_time > 0, accumulated_time, 1), 1.0), 0.0)
+    offset = scale * event_bytes
+    scale[run_starts] = 0.0  # A run starts from an empty accumulation
+    shift = 1
+    while shift < num_events and scale[shift:].any():
+        offset[shift:] = scale[shift:] * offset[:-shift] + offset[shift:]
+        scale[shift:] = scale[shift:] * scale[:-shift]
+        shift *= 2
+
+    leftover_bytes = offset
+    accumulated_bytes = np.concatenate(([0.0], leftover_bytes[:-1])) + event_bytes
+    accumulated_bytes[run_starts] = event_bytes[run_starts]
+
+    return period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, run_ends, leftover_bytes[run_ends - 1]
+
+
+def _strict_interval_points(prev_times, period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, sampling_period, begin_time):
+    """
+    One throughput point per sampling period completed in _strict_intervals, each taking sampling_period / accumulated_time
+    of the accumulated bytes.
+
+    Returns:
+        tuple: (point_events, times_sec, throughput_mbps) arrays, point_events being the event that completed each period
+    """
+    emitting = np.flatnonzero(period_events)
+    counts = period_events[emitting]
+    point_events = np.repeat(emitting, counts)
+    point_indices = np.repeat(period_indices[emitting] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    # Sampling periods are counted from the start of their run
+    run_of_point = np.searchsorted(run_starts, point_events, side='right') - 1
+    interval_starts = prev_times[run_starts][run_of_point] + point_indices * sampling_period
+    bytes_for_period = accumulated_bytes[point_events] * (sampling_period / accumulated_time[point_events])
+
+    times_sec = (interval_starts - begin_time) / 1000  # Convert to seconds
+    throughput_mbps = (bytes_for_period / sampling_period) * 1000 * (8/1000000)  # Convert to Mbps
+    return point_events, times_sec, throughput_mbps
 
 
 #-----------------------------------Throughput Calculation---------------------------------------------
@@ -18,208 +221,119 @@ def calculate_traditional_throughput(aggregated_time, byte_count, num_flows, beg
     This produces various time intervals, mostly 1 or 2 ms. Only calculate the throughput if all flows are contributing at that point.
     TODO: Delete this function, we have not used it since September 2025
     """
-    throughput_results = []
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    all_flows = in_byte_count & (event_flows == num_flows)
+    event_times, prev_times, event_bytes = event_times[all_flows], prev_times[all_flows], event_bytes[all_flows]
 
-        if current_list_time in byte_count and byte_count[current_list_time][1] == num_flows:
-        #if current_list_time in byte_count:
-            # Calculate throughput in bytes/second
-            throughput = byte_count[current_list_time][0]/((current_list_time-prev_list_time)/1000)
+    # Throughput of every event at once, in bytes/second and then converted to Mbps
+    throughputs = event_bytes / ((event_times - prev_times) / 1000) * (8 / 1000000)
+    times = (event_times - begin_time) / 1000  # Convert to seconds
 
-            throughput_results.append({
-                "time": (current_list_time - begin_time)/1000,  # Convert to seconds
-                "throughput": throughput*(8/1000000)  # Convert to Mbps
-            })
-
-    return throughput_results
+    return [{"time": time, "throughput": throughput} for time, throughput in zip(times.tolist(), throughputs.tolist())]
 
 def calculate_interval_threshold_throughput(aggregated_time, byte_count, num_flows, interval_threshold, begin_time):
-    throughput_results = []
-    accumulated_bytes = 0
-    accumulated_time = 0
-    interval_start = None
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
-        time_diff = current_list_time - prev_list_time
-
-        # Skip if not all flows are contributing (current_list_time should always be in byte_count, unless it is the last timestamp)
-        if current_list_time not in byte_count or byte_count[current_list_time][1] != num_flows:
-            # Reset accumulation if we skip a point
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
-            continue
-
-        # Start new interval if needed
-        if interval_start is None:
-            interval_start = prev_list_time
-
-        # Add current interval's bytes and time
-        accumulated_bytes += byte_count[current_list_time][0]
-        accumulated_time += time_diff
-
-        # If we've reached or exceeded the threshold, calculate throughput
-        if accumulated_time >= interval_threshold:
-            # Calculate throughput for this combined interval
-            throughput = (accumulated_bytes/accumulated_time) * 1000  # conversion to bytes/second
-
-            throughput_results.append({
-                'time': (interval_start - begin_time)/1000,  # time since start in seconds
-                'throughput': throughput * (8/1000000)  # conversion to Mbps
-            })
-
-            # Reset accumulators
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
+    # Only events where all flows are contributing are used, anything else resets the accumulation
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    valid = in_byte_count & (event_flows == num_flows)
 
-    return throughput_results
+    # Combine consecutive valid events until the accumulated time reaches the threshold, then calculate the throughput
+    interval_starts, interval_ends, _, _ = _threshold_intervals(event_times, prev_times, valid, interval_threshold)
+    return _interval_throughput_results(event_times, prev_times, event_bytes, interval_starts, interval_ends, begin_time)
 
 def calculate_interval_threshold_throughput_tracking_discarded_data(aggregated_time, byte_count, num_flows, interval_threshold, begin_time, all_data = False):
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
 
-    throughput_results = []
-    accumulated_bytes = 0
-    accumulated_time = 0
-    interval_start = None
-
-    discarded_intervals = 0  # Number of accumulated intervals discarded
-    discarded_objects = 0    # Number of individual objects discarded
-    discarded_bytes = 0
-    discarded_time = 0
-    objects_in_current_interval = 0  # Track how many objects are in current accumulated interval
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
-        time_diff = current_list_time - prev_list_time
-
-        # Skip if not all flows are contributing (current_list_time should always be in byte_count, unless it is the last timestamp)
-        if all_data: # If all data is selected, only skip if there are 0 flows
-            data_accumulation_reset = current_list_time not in byte_count or byte_count[current_list_time][1] <= 0
-        else:
-            data_accumulation_reset = current_list_time not in byte_count or byte_count[current_list_time][1] != num_flows
-        if data_accumulation_reset:
-            # Track discarded data before resetting
-            if accumulated_bytes > 0:
-                discarded_intervals += 1
-                discarded_objects += objects_in_current_interval
-                discarded_bytes += accumulated_bytes
-                discarded_time += accumulated_time
-
-            # Also discard bytes from current invalid interval if it exists in byte_count
-            if current_list_time in byte_count:
-                discarded_objects += 1
-                discarded_bytes += byte_count[current_list_time][0]
-                discarded_time += time_diff
-
-            # Reset accumulation if we skip a point
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
-            objects_in_current_interval = 0
-            continue
-
-        # Start new interval if needed
-        if interval_start is None:
-            interval_start = prev_list_time
-
-        # Add current interval's bytes and time
-        accumulated_bytes += byte_count[current_list_time][0]
-        accumulated_time += time_diff
-        objects_in_current_interval += 1
-
-        # If we've reached or exceeded the threshold, calculate throughput
-        if accumulated_time >= interval_threshold:
-            # Calculate throughput for this combined interval
-            throughput = (accumulated_bytes/accumulated_time) * 1000  # conversion to bytes/second
-
-            throughput_results.append({
-                'time': (interval_start - begin_time)/1000,  # time since start in seconds
-                'throughput': throughput * (8/1000000)  # conversion to Mbps
-            })
+    # Skip if not all flows are contributing (current_list_time should always be in byte_count, unless it is the last timestamp)
+    if all_data: # If all data is selected, only skip if there are 0 flows
+        valid = in_byte_count & (event_flows > 0)
+    else:
+        valid = in_byte_count & (event_flows == num_flows)
+
+    # Combine consecutive valid events until the accumulated time reaches the threshold, then calculate the throughput
+    interval_starts, interval_ends, leftover_starts, leftover_ends = _threshold_intervals(event_times, prev_times, valid, interval_threshold)
+    throughput_results = _interval_throughput_results(event_times, prev_times, event_bytes, interval_starts, interval_ends, begin_time)
 
-            # Reset accumulators
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
-            objects_in_current_interval = 0
+    # Accumulated data that never reached the threshold before a reset (or the end of the data) is discarded,
+    # as long as it holds some bytes
+    bytes_prefix = np.concatenate(([0], np.cumsum(event_bytes)))
+    leftover_bytes = bytes_prefix[leftover_ends] - bytes_prefix[leftover_starts]
+    discarded_leftovers = leftover_bytes > 0
+    leftover_time = event_times[leftover_ends - 1] - prev_times[leftover_starts]
 
-    # Check if there's any remaining accumulated data at the end that didn't meet threshold
-    if accumulated_bytes > 0:
-        discarded_intervals += 1
-        discarded_objects += objects_in_current_interval
-        discarded_bytes += accumulated_bytes
-        discarded_time += accumulated_time
+    # The invalid events themselves are also discarded if they exist in byte_count
+    discarded_events = ~valid & in_byte_count
+    time_diffs = event_times - prev_times
 
     discarded_stats = {
-        'discarded_intervals': discarded_intervals,
-        'discarded_objects': discarded_objects,
-        'discarded_bytes': discarded_bytes,
-        'discarded_time': discarded_time
+        'discarded_intervals': int(np.count_nonzero(discarded_leftovers)),
+        'discarded_objects': int((leftover_ends - leftover_starts)[discarded_leftovers].sum() + np.count_nonzero(discarded_events)),
+        'discarded_bytes': int(leftover_bytes[discarded_leftovers].sum() + event_bytes[discarded_events].sum()),
+        'discarded_time': int(leftover_time[discarded_leftovers].sum() + time_diffs[discarded_events].sum())
     }
 
     return throughput_results, discarded_stats
 
+def calculate_interval_threshold_throughput_by_flows(aggregated_time, byte_count, max_flows, interval_threshold, begin_time):
+    """
+    Interval threshold throughput for every flow count from 1 to max_flows, in one pass.
+
+    Gives the same results as calling calculate_interval_threshold_throughput_tracking_discarded_data once per flow count,
+    but byte_count is converted once and every flow count is handled by a single _threshold_intervals call, since the
+    events of different flow counts never share a run.
+
+    Returns:
+        dict: {flow_count: throughput_results}, only for the flow counts that have at least one throughput point, except
+              max_flows which is always present (with an empty list if it has no points) for the max flow count plot
+    """
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    valid = in_byte_count & (event_flows >= 1) & (event_flows <= max_flows)
+
+    interval_starts, interval_ends, _, _ = _threshold_intervals(event_times, prev_times, valid, interval_threshold, run_keys=event_flows)
+    interval_flows = event_flows[interval_starts]
+
+    # Flow counts without any interval are left out, so they are not plotted. max_flows is always kept, so the max flow
+    # count plot shows that it has no data instead of plotting a lower flow count
+    throughput_by_flows = {}
+    for flow_count in np.flatnonzero(np.bincount(interval_flows, minlength=max_flows + 1)).tolist():
+        of_flow_count = interval_flows == flow_count
+        throughput_by_flows[flow_count] = _interval_throughput_results(
+            event_times, prev_times, event_bytes, interval_starts[of_flow_count], interval_ends[of_flow_count], begin_time)
+    if max_flows >= 1:
+        throughput_by_flows.setdefault(max_flows, [])
+
+    return throughput_by_flows
+
 def calculate_throughput_with_less_flows(aggregated_time, byte_count, num_flows, interval_threshold, begin_time):
     """
     Calculate throughput for entries with num_flows and num_flows - 1, keeping them in separate lists.
     Both lists follow the same time interval threshold calculation technique.
     """
-    throughput_results = []  # For num_flows
-    less_flows_results = []  # For num_flows - 1
-    accumulated_bytes = 0
-    accumulated_time = 0
-    interval_start = None
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i - 1]
-        time_diff = current_list_time - prev_list_time
-
-        # Check if num_flows - 1 are contributing
-        if current_list_time in byte_count and byte_count[current_list_time][1] == num_flows - 1:
-            accumulated_bytes += byte_count[current_list_time][0]
-            accumulated_time += time_diff
-
-            if accumulated_time >= interval_threshold:
-                throughput = (accumulated_bytes / accumulated_time) * 1000  # Convert to bytes/second
-                less_flows_results.append({
-                    'time': (prev_list_time - begin_time) / 1000,  # Time since start in seconds
-                    'throughput': throughput * (8 / 1000000)  # Convert to Mbps
-                })
-                accumulated_bytes = 0
-                accumulated_time = 0
-
-        # Skip if not all flows are contributing
-        if current_list_time not in byte_count or byte_count[current_list_time][1] != num_flows:
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
-            continue
-
-        # Start new interval if needed
-        if interval_start is None:
-            interval_start = prev_list_time
-
-        # Add current interval's bytes and time
-        accumulated_bytes += byte_count[current_list_time][0]
-        accumulated_time += time_diff
-
-        # If we've reached or exceeded the threshold, calculate throughput
-        if accumulated_time >= interval_threshold:
-            throughput = (accumulated_bytes / accumulated_time) * 1000  # Convert to bytes/second
-            throughput_results.append({
-                'time': (interval_start - begin_time) / 1000,  # Time since start in seconds
-                'throughput': throughput * (8 / 1000000)  # Convert to Mbps
-            })
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    all_flows = in_byte_count & (event_flows == num_flows)
+    one_less_flow = in_byte_count & (event_flows == num_flows - 1)
+
+    # The num_flows list is the interval threshold calculation over the events where all flows are contributing
+    interval_starts, interval_ends, leftover_starts, leftover_ends = _threshold_intervals(event_times, prev_times, all_flows, interval_threshold)
+    throughput_results = _interval_throughput_results(event_times, prev_times, event_bytes, interval_starts, interval_ends, begin_time)
+
+    # Both lists share one accumulator, which is reset after every num_flows - 1 event. Such an event is therefore
+    # measured on its own, plus whatever a run of all-flows events right before it left below the threshold
+    bytes_prefix = np.concatenate(([0], np.cumsum(event_bytes)))
+    carried_bytes = np.zeros(len(event_times) + 1, dtype=np.int64)
+    carried_time = np.zeros(len(event_times) + 1, dtype=np.int64)
+    carried_bytes[leftover_ends] = bytes_prefix[leftover_ends] - bytes_prefix[leftover_starts]
+    carried_time[leftover_ends] = event_times[leftover_ends - 1] - prev_times[leftover_starts]
+
+    less_flows_events = np.flatnonzero(one_less_flow)
+    accumulated_bytes = carried_bytes[less_flows_events] + event_bytes[less_flows_events]
+    accumulated_time = carried_time[less_flows_events] + (event_times - prev_times)[less_flows_events]
+    reached_threshold = accumulated_time >= interval_threshold
+    accumulated_bytes, accumulated_time = accumulated_bytes[reached_threshold], accumulated_time[reached_threshold]
+
+    throughputs = (accumulated_bytes / accumulated_time) * 1000  # Convert to bytes/second
+    times = (prev_times[less_flows_events[reached_threshold]] - begin_time) / 1000  # Time since start in seconds
+    less_flows_results = [{'time': time, 'throughput': throughput}
+                          for time, throughput in zip(times.tolist(), (throughputs * (8 / 1000000)).tolist())]  # Convert to Mbps
 
     return throughput_results, less_flows_results
 
@@ -237,53 +351,34 @@ def calculate_throughput_separate_flows(aggregated_time, byte_count, num_flows,
     of consistent flow counts.
     """
 
-    throughput_results = []
-    accumulated_bytes = 0
-    accumulated_time = 0
-    interval_start = None
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
-        time_diff = current_list_time - prev_list_time
-
-        # Check if this point has the required number of flows
-        if current_list_time in byte_count and byte_count[current_list_time][1] == num_flows:
-            # Start new interval if needed
-            if interval_start is None:
-                interval_start = prev_list_time
-
-            # Add current interval's bytes and time
-            accumulated_bytes += byte_count[current_list_time][0]
-            accumulated_time += time_diff
-        else:
-            # Flow count changed or point not in byte_count - calculate throughput if we have accumulated data
-            if accumulated_bytes > 0 and accumulated_time > 0:
-                # Calculate throughput for this accumulated interval
-                throughput = (accumulated_bytes/accumulated_time) * 1000  # conversion to bytes/second
-
-                throughput_results.append({
-                    'time': (interval_start - begin_time)/1000,  # time since start in seconds
-                    'throughput': throughput * (8/1000000),  # conversion to Mbps
-                    'duration': accumulated_time / 1000  # duration in seconds
-                })
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    all_flows = in_byte_count & (event_flows == num_flows)
 
-            # Reset accumulators
-            accumulated_bytes = 0
-            accumulated_time = 0
-            interval_start = None
+    # Each run of consecutive events with the required number of flows is one interval, closed when the flow count
+    # changes, a point is not in byte_count, or the data ends. The runs are found at once instead of accumulating
+    # event by event
+    edges = np.diff(np.concatenate(([0], all_flows.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)  # Exclusive
 
-    # Calculate throughput for any remaining accumulated data at the end
-    if accumulated_bytes > 0 and accumulated_time > 0:
-        throughput = (accumulated_bytes/accumulated_time) * 1000  # conversion to bytes/second
+    bytes_prefix = np.concatenate(([0], np.cumsum(event_bytes)))
+    time_prefix = np.concatenate(([0], np.cumsum(event_times - prev_times)))
+    accumulated_bytes = bytes_prefix[run_ends] - bytes_prefix[run_starts]
+    accumulated_time = time_prefix[run_ends] - time_prefix[run_starts]
+    interval_start = prev_times[run_starts]
 
-        throughput_results.append({
-            'time': (interval_start - begin_time)/1000,  # time since start in seconds
-            'throughput': throughput * (8/1000000),  # conversion to Mbps
-            'duration': accumulated_time / 1000  # duration in seconds
-        })
+    # Only intervals with accumulated data have a throughput
+    has_data = (accumulated_bytes > 0) & (accumulated_time > 0)
+    accumulated_bytes, accumulated_time, interval_start = accumulated_bytes[has_data], accumulated_time[has_data], interval_start[has_data]
 
-    return throughput_results
+    throughputs = (accumulated_bytes / accumulated_time) * 1000  # conversion to bytes/second
+    return [{
+        'time': time,  # time since start in seconds
+        'throughput': throughput,  # conversion to Mbps
+        'duration': duration  # duration in seconds
+    } for time, throughput, duration in zip(((interval_start - begin_time) / 1000).tolist(),
+                                            (throughputs * (8 / 1000000)).tolist(),
+                                            (accumulated_time / 1000).tolist())]
 
 
 def calculate_accurate_throughput_with_smooth_plot(aggregated_time, byte_count, num_flows, window_size_ms, begin_time):
@@ -318,13 +413,14 @@ def calculate_accurate_throughput_with_smooth_plot(aggregated_time, byte_count,
     total_bytes = 0
     min_time = float('inf')
     max_time = -1
+    event_times, prev_times, event_bytes, all_flows = _positional_events(aggregated_time, byte_count, num_flows)
 
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
+    for i in range(len(event_times)):
+        current_list_time = event_times[i]
+        prev_list_time = prev_times[i]
 
-        if current_list_time in byte_count and byte_count[current_list_time][1] == num_flows:
-            bytes_val = byte_count[current_list_time][0]
+        if all_flows[i]:
+            bytes_val = event_bytes[i]
             time_diff = current_list_time - prev_list_time
 
             qualifying_points.append({
@@ -413,37 +509,33 @@ def calculate_throughput_weighted_points(aggregated_time, byte_count, num_flows,
 
         This weighted_mean will equal result['overall_throughput']
     """
-    weighted_points = []
-    total_bytes = 0
-    total_time_ms = 0
-
-    # First pass: collect all qualifying points and calculate totals
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
 
-        # Only consider points where all flows are contributing
-        if current_list_time in byte_count and byte_count[current_list_time][1] == num_flows:
-            bytes_val = byte_count[current_list_time][0]
-            time_diff = current_list_time - prev_list_time
+    # Only consider points where all flows are contributing. Their intervals and times since start are computed once,
+    # as arrays, instead of subtracting and dividing again for every point
+    all_flows = in_byte_count & (event_flows == num_flows)
+    time_diffs = (event_times - prev_times)[all_flows]
+    times_sec = (event_times[all_flows] - begin_time) / 1000  # seconds since start
+    bytes_vals = event_bytes[all_flows]
 
-            # Calculate instantaneous throughput for this interval
-            throughput_mbps = (bytes_val / time_diff) * 1000 * (8/1000000) if time_diff > 0 else 0
+    # Calculate instantaneous throughput for each interval
+    throughputs = np.divide(bytes_vals, time_diffs, out=np.zeros(len(time_diffs)), where=time_diffs > 0) * 1000 * (8/1000000)
 
-            weighted_points.append({
-                'time': (current_list_time - begin_time) / 1000,  # seconds since start
-                'throughput': throughput_mbps,
-                'interval_ms': time_diff,
-                'bytes': bytes_val
-            })
+    total_bytes = int(bytes_vals.sum())
+    total_time_ms = int(time_diffs.sum())
 
-            total_bytes += bytes_val
-            total_time_ms += time_diff
-
-    # Second pass: assign weights as fraction of total time
+    # Assign weights as fraction of total time
     total_time_sec = total_time_ms / 1000
-    for point in weighted_points:
-        point['weight'] = point['interval_ms'] / total_time_ms if total_time_ms > 0 else 0
+    weights = time_diffs / total_time_ms if total_time_ms > 0 else np.zeros(len(time_diffs))
+
+    weighted_points = [{
+        'time': time,
+        'throughput': throughput,
+        'interval_ms': interval_ms,
+        'bytes': bytes_val,
+        'weight': weight
+    } for time, throughput, interval_ms, bytes_val, weight in zip(times_sec.tolist(), throughputs.tolist(), time_diffs.tolist(),
+                                                               bytes_vals.tolist(), weights.tolist())]
 
     # Calculate overall throughput (equivalent to weighted mean)
     overall_throughput = (total_bytes / total_time_ms) * 1000 * (8/1000000) if total_time_ms > 0 else 0
@@ -458,99 +550,79 @@ def calculate_throughput_weighted_points(aggregated_time, byte_count, num_flows,
 
 #March 28, 2026
 def calculate_throughput_strict_intervals(aggregated_time, byte_count, num_flows, sampling_period, begin_time, all_data=False):
-    throughput_results = []
-    accumulated_bytes = 0
-    accumulated_time = 0
-    current_interval_start = None  # start time of current sampling period (this is a timestamp)
-
-    # Track discarded data
-    discarded_intervals = 0  # Number of incomplete intervals discarded
-    discarded_bytes = 0  # Total bytes discarded
-    discarded_time = 0  # Total time (ms) discarded
-    discarded_objects = 0  # Number of whole byte_count events discarded
-    objects_in_current_accumulation = 0  # Track objects in current incomplete interval
-
-    for i in range(1, len(aggregated_time)):
-        current_list_time = aggregated_time[i]
-        prev_list_time = aggregated_time[i-1]
-        time_diff = current_list_time - prev_list_time
-
-        # Determine if this particular byte_count event should be used
-        if all_data:
-            # Use all data where at least one flow is contributing
-            valid_data = current_list_time in byte_count and byte_count[current_list_time][1] > 0
-        else:
-            # Only use data where all flows are contributing
-            valid_data = current_list_time in byte_count and byte_count[current_list_time][1] == num_flows
-
-        # If this interval isn't valid (0 flows, or isn't max flow), discard it and move to the next byte_count interval
-        if not valid_data:
-            # Discard any accumulated bytes from previous valid intervals
-            if accumulated_bytes > 0:
-                discarded_intervals += 1
-                discarded_bytes += accumulated_bytes
-                discarded_time += accumulated_time
-                discarded_objects += objects_in_current_accumulation
-
-            # Also discard bytes from current invalid interval if it exists in byte_count
-            if current_list_time in byte_count:
-                discarded_objects += 1  # Count this whole invalid event
-                discarded_bytes += byte_count[current_list_time][0]
-                discarded_time += time_diff
-
-            # Reset accumulators
-            accumulated_bytes = 0
-            accumulated_time = 0
-            current_interval_start = None
-            objects_in_current_accumulation = 0
-            continue
-
-        # For valid byte_count bins, get bytes
-        interval_bytes = byte_count[current_list_time][0]
-
-        # Start a new interval if one doesn't already exist
-        if current_interval_start is None:
-            current_interval_start = prev_list_time
-
-        # Add incoming data to accumulators (there may be bytes/time from the previous interval)
-        accumulated_bytes += interval_bytes
-        accumulated_time += time_diff
-        objects_in_current_accumulation += 1
-
-        # While the accumulated time is greater than or equal to the sampling period,
-        # calculate throughput for each sampling period using proportional byte distribution
-        while accumulated_time >= sampling_period:
-            # Calculate proportion of accumulated data that fits in this sampling period
-            proportion = sampling_period / accumulated_time
-            bytes_for_period = accumulated_bytes * proportion
-
-            throughput_results.append({
-                'time': (current_interval_start - begin_time) / 1000,  # Convert to seconds
-                'throughput': (bytes_for_period / sampling_period) * 1000 * (8/1000000)  # Convert to Mbps
-            })
-
-            # Subtract what we just used from accumulators
-            accumulated_bytes -= bytes_for_period
-            accumulated_time -= sampling_period
-            current_interval_start += sampling_period
-
-            # Note: We don't reset objects_in_current_accumulation here because the same objects
-            # may contribute to multiple sampling periods. We only reset when we encounter
-            # invalid data or finish processing.
-
-    # At the very end of byte_count, if there is any remaining data that didn't
-    # complete a full sampling period, add it to the discard pile
-    if accumulated_bytes > 0:
-        discarded_intervals += 1
-        discarded_bytes += accumulated_bytes
-        discarded_time += accumulated_time
-        discarded_objects += objects_in_current_accumulation
+    """
+    Throughput over fixed sampling periods. Consecutive valid byte_count events are accumulated, and every time the
+    accumulated time reaches the sampling period a throughput point is taken from it, distributing the bytes
+    proportionally. Whatever is accumulated when an invalid event (or the end of the data) is reached is discarded.
+    """
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+
+    # Determine if each byte_count event should be used
+    if all_data:
+        # Use all data where at least one flow is contributing
+        valid = in_byte_count & (event_flows > 0)
+    else:
+        # Only use data where all flows are contributing
+        valid = in_byte_count & (event_flows == num_flows)
+
+    period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, run_ends, run_leftovers = _strict_intervals(
+        event_times, prev_times, event_bytes, valid, sampling_period)
+
+    _, times_sec, throughput_mbps = _strict_interval_points(
+        prev_times, period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, sampling_period, begin_time)
+    throughput_results = [{'time': time_sec, 'throughput': tp} for time_sec, tp in zip(times_sec.tolist(), throughput_mbps.tolist())]
+
+    # Data still accumulated at the end of a run never completed a sampling period, add it to the discard pile.
+    # Invalid events are discarded as well if they exist in byte_count
+    discarded_runs = run_leftovers > 0
+    discarded_events = ~valid & in_byte_count
+    run_lengths = run_ends - run_starts
+    run_times = event_times[run_ends - 1] - prev_times[run_starts]
+    run_periods = run_times // sampling_period
+    leftover_times = run_times - run_periods * sampling_period
+
+    # Leftover bytes are fractional once their run has completed a sampling period
+    discarded_bytes = run_leftovers[discarded_runs].sum() + event_bytes[discarded_events].sum()
+    discarded_bytes = float(discarded_bytes) if (run_periods[discarded_runs] > 0).any() else int(discarded_bytes)
 
     discarded_stats = {
-        'discarded_intervals': discarded_intervals,
+        'discarded_intervals': int(np.count_nonzero(discarded_runs)),
         'discarded_bytes': discarded_bytes,
-        'discarded_time': discarded_time,
-        'discarded_objects': discarded_objects
+        'discarded_time': int(leftover_times[discarded_runs].sum() + (event_times - prev_times)[discarded_events].sum()),
+        'discarded_objects': int(run_lengths[discarded_runs].sum() + np.count_nonzero(discarded_events))
     }
 
     return throughput_results, discarded_stats
+
+def calculate_throughput_strict_intervals_by_flows(aggregated_time, byte_count, max_flows, sampling_period, begin_time):
+    """
+    Strict interval throughput for every flow count from 1 to max_flows, in one pass.
+
+    Gives the same throughput results as calling calculate_throughput_strict_intervals once per flow count, but byte_count
+    is converted once and every flow count is handled by a single _strict_intervals call, since the events of different
+    flow counts never share a run.
+
+    Returns:
+        dict: {flow_count: throughput_results}, only for the flow counts that have at least one throughput point, except
+              max_flows which is always present (with an empty list if it has no points) for the max flow count plot
+    """
+    event_times, prev_times, event_bytes, event_flows, in_byte_count = _byte_count_events(aggregated_time, byte_count)
+    valid = in_byte_count & (event_flows >= 1) & (event_flows <= max_flows)
+
+    period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, _, _ = _strict_intervals(
+        event_times, prev_times, event_bytes, valid, sampling_period, run_keys=event_flows)
+    point_events, times_sec, throughput_mbps = _strict_interval_points(
+        prev_times, period_events, period_indices, accumulated_bytes, accumulated_time, run_starts, sampling_period, begin_time)
+    point_flows = event_flows[point_events]
+
+    # Flow counts without any sampling period are left out, so they are not plotted. max_flows is always kept, so the max flow
+    # count plot shows that it has no data instead of plotting a lower flow count
+    throughput_by_flows = {}
+    for flow_count in np.flatnonzero(np.bincount(point_flows, minlength=max_flows + 1)).tolist():
+        of_flow_count = point_flows == flow_count
+        throughput_by_flows[flow_count] = [{'time': time_sec, 'throughput': tp} for time_sec, tp in
+                                           zip(times_sec[of_flow_count].tolist(), throughput_mbps[of_flow_count].tolist())]
+    if max_flows >= 1:
+        throughput_by_flows.setdefault(max_flows, [])
+
+    return throughput_by_flows
@@ -1,21 +1,27 @@
 import dimension_throughput_calc as tp_calc
+import data_normalization as data_norm
 import numpy as np
 
-def run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size, data_selection, stats_accumulator, config_accumulator):
+def run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size, data_selection, stats_accumulator, config_accumulator, byte_count_arrays=None):
     """
         Main driver to compute the throughput
+
+        byte_count_arrays is the (times, sums, counts) layout of byte_count from the normalization driver. When it is
+        not given it is built here, once, and shared by every throughput calculation below.
     """
     num_flows = stats_accumulator.get("num_sockets")
+    if byte_count_arrays is None:
+        byte_count_arrays = data_norm.byte_count_arrays(byte_count)
 
     # Calculate throughput with the specified bin size, tracking discarded data
     # throughput_results, discarded_stats = tp_calc.calculate_interval_threshold_throughput_tracking_discarded_data(
     #     aggregated_time, byte_count, num_flows, bin_size, begin_time, all_data=data_selection)
 
     strict_interval_throughput_results, strict_interval_discarded_stats = tp_calc.calculate_throughput_strict_intervals(
-        aggregated_time, byte_count, num_flows, bin_size, begin_time, data_selection)
+        aggregated_time, byte_count_arrays, num_flows, bin_size, begin_time, data_selection)
 
     threshold_interval_throughput_results, threshold_interval_discarded_stats = tp_calc.calculate_interval_threshold_throughput_tracking_discarded_data(
-        aggregated_time, byte_count, num_flows, bin_size, begin_time, data_selection)
+        aggregated_time, byte_count_arrays, num_flows, bin_size, begin_time, data_selection)
 
 
     ## 3-24-2026 TODO: Since artifact filtering is now AFTER throughput computation, this needs to be moved
@@ -34,7 +40,7 @@ def run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, b
     config_accumulator.add('bulk_throughput_mbps', float(bulk_throughput_mbps))
 
     # Add aggregated data point count (before binning)
-    num_max_flow_points = len([ts for ts in byte_count if byte_count[ts][1] == num_flows])
+    num_max_flow_points = int(np.count_nonzero(byte_count_arrays.counts == num_flows))
     # config_accumulator.add('num_max_flow_points', num_max_flow_points)
 
     # Add discarded data statistics (bytes only discarded by binning with max flows)
@@ -49,8 +55,7 @@ def run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, b
     # Calculate percentages for discarded data
     total_bytes = stats_accumulator.get("total_processed_bytes")
     total_points = len(byte_count)
-    all_timestamps = list(byte_count.keys())
-    total_time_ms = max(all_timestamps) - min(all_timestamps) if all_timestamps else 0
+    total_time_ms = int(np.ptp(byte_count_arrays.times)) if len(byte_count_arrays.times) > 0 else 0
 
     print("total discarded byte:", strict_interval_discarded_stats['discarded_bytes'], "and total bytes:", total_bytes)
 
@@ -76,14 +81,12 @@ def run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, b
 
     # Calculate throughput grouped by number of flows (for plotting)
     # These are NOT added to config_accumulator since they're just for visualization
-    threshold_throughput_by_flows = {}
-    strict_throughput_by_flows = {}
-    for flow_count in range(1, num_flows + 1):
-        threshold_throughput_by_flows[flow_count], _ = tp_calc.calculate_interval_threshold_throughput_tracking_discarded_data(
-            aggregated_time, byte_count, flow_count, bin_size, begin_time)
-
-        strict_throughput_by_flows[flow_count], _ = tp_calc.calculate_throughput_strict_intervals(
-            aggregated_time, byte_count, flow_count, bin_size, begin_time)
+    # All flow counts share one pass for each method
+    threshold_throughput_by_flows = tp_calc.calculate_interval_threshold_throughput_by_flows(
+        aggregated_time, byte_count_arrays, num_flows, bin_size, begin_time)
+
+    strict_throughput_by_flows = tp_calc.calculate_throughput_strict_intervals_by_flows(
+        aggregated_time, byte_count_arrays, num_flows, bin_size, begin_time)
 
     return {
         "strict_interval_throughput_results": strict_interval_throughput_results,
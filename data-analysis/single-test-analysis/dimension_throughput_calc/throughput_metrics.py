@@ -22,17 +22,19 @@ def compute_throughput_metrics(throughput_results, throughput_method):
             - {throughput_method}_num_throughput_bins
     """
     if throughput_results:
-        throughputs = [point['throughput'] for point in throughput_results]
+        # One float64 column, instead of every numpy call below converting the Python list again
+        throughputs = np.fromiter((point['throughput'] for point in throughput_results), dtype=np.float64, count=len(throughput_results))
         mean_val = float(np.mean(throughputs))
+        std_val = float(np.std(throughputs))
 
         metrics = {
             f'{throughput_method}_mean_throughput_mbps': mean_val,
             f'{throughput_method}_median_throughput_mbps': float(np.median(throughputs)),
-            f'{throughput_method}_std_throughput_mbps': float(np.std(throughputs)),
+            f'{throughput_method}_std_throughput_mbps': std_val,
             f'{throughput_method}_min_throughput_mbps': float(np.min(throughputs)),
             f'{throughput_method}_max_throughput_mbps': float(np.max(throughputs)),
             f'{throughput_method}_95th_percentile_throughput_mbps': float(np.percentile(throughputs, 95)),
-            f'{throughput_method}_coefficient_of_variation': float(np.std(throughputs) / mean_val) if mean_val > 0 else 0.0,
+            f'{throughput_method}_coefficient_of_variation': std_val / mean_val if mean_val > 0 else 0.0,
             f'{throughput_method}_variance_throughput_mbps': float(np.var(throughputs)),
             f'{throughput_method}_num_throughput_bins': len(throughput_results)
         }
@@ -21,24 +21,23 @@ import argparse
 import os
 import math
 import json
+from functools import lru_cache
 
 # Custom modules.
 import data_normalization as dn
 import dimension_throughput_calc as tp_calc
-import plots
 from statistics import StatisticsAccumulator, save_socket_stream_data
 import dimension_data_selection as data_selection
 import dimension_artifact as artifact
 import dimension_slow_start as slow_start
 
 
-def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_data=True, save_plots=False):
+@lru_cache(maxsize=None)
+def get_server_name(base_path):
     """
-    Wrapper function call to allow for this function being called elsewhere (for comparing tests)
+    Get the server name for a test, cached per base_path so analyzing the same test under several configurations
+    (or from a comparison script) only reads speedtest_result.json once.
     """
-    print(f"Analyzing test: {base_path}")
-    print(f"Bin size: {bin_size}ms\n")
-
     # Extract server from speedtest_result.json one level above base_path
     parent_dir = os.path.dirname(base_path.rstrip('/'))
     speedtest_result_path = os.path.join(parent_dir, "speedtest_result.json")
@@ -51,6 +50,17 @@ def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_d
         print(f"Warning: Could not read server from {speedtest_result_path}: {e}")
         # Fallback to parsing from path
         server = os.path.basename(os.path.dirname(base_path) if base_path.endswith(('download','download/','upload/','upload')) else base_path).split('-')[0]
+    return server
+
+
+def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_data=True, save_plots=False):
+    """
+    Wrapper function call to allow for this function being called elsewhere (for comparing tests)
+    """
+    print(f"Analyzing test: {base_path}")
+    print(f"Bin size: {bin_size}ms\n")
+
+    server = get_server_name(base_path)
 
     print(f"Server: {server}\n")
 
@@ -71,7 +81,8 @@ def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_d
 
     # Step 2: Data Selection -----------------------------------------
     # TODO Data selection, collect these metrics
-    data_selection_results = data_selection.run_data_selection_driver(byte_count, aggregated_time, stats_accumulator)
+    data_selection_results = data_selection.run_data_selection_driver(byte_count, aggregated_time, stats_accumulator,
+                                                                      byte_count_arrays=normalization_data['byte_count_arrays'])
 
     # Run single configuration
     print(f"Running configuration: Artifact Filter={artifact_filter}, Bin Size={bin_size}ms, All Data={all_data}")
@@ -84,7 +95,8 @@ def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_d
 
     # Step 3: Throughput Calculation / Binning ----------------------------------
     print(f"Running throughput calculation driver")
-    all_throughput_data = tp_calc.run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size, all_data, stats_accumulator, config_accumulator)
+    all_throughput_data = tp_calc.run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size, all_data, stats_accumulator, config_accumulator,
+                                                                    byte_count_arrays=normalization_data['byte_count_arrays'])
 
     # Step 4: Artifact Filtering ----------------------------------------------------
     strict_interval_throughput_results = artifact.run_artifact_filter(
@@ -141,6 +153,8 @@ def run_single_test_analysis(base_path, bin_size=1, artifact_filter=False, all_d
             "all_throughput_data": all_throughput_data,
             "filtered_throughput_data": filtered_throughput_data,
         }
+        # Only pull in the plotting stack when plots are actually requested
+        import plots
         plots.run_plot_driver(plot_data)
 
     # Step 7: Write Stats Accumulator to JSON -------------------------
@@ -168,18 +182,7 @@ def run_all_configs_analysis(base_path, save_plots=False):
     print("Computing all configurations.")
     print("\n" + "="*60)
 
-    # Extract server from speedtest_result.json one level above base_path
-    parent_dir = os.path.dirname(base_path.rstrip('/'))
-    speedtest_result_path = os.path.join(parent_dir, "speedtest_result.json")
-
-    try:
-        with open(speedtest_result_path, 'r') as f:
-            speedtest_data = json.load(f)
-            server = str(speedtest_data.get('server', 'Unknown')).capitalize()
-    except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-        print(f"Warning: Could not read server from {speedtest_result_path}: {e}")
-        # Fallback to parsing from path
-        server = os.path.basename(os.path.dirname(base_path) if base_path.endswith(('download','download/','upload/','upload')) else base_path).split('-')[0]
+    server = get_server_name(base_path)
 
     print(f"Server: {server}\n")
 
@@ -200,7 +203,8 @@ def run_all_configs_analysis(base_path, save_plots=False):
 
     # Step 2: Data Selection -----------------------------------------
     # TODO Data selection, collect these metrics
-    data_selection_results = data_selection.run_data_selection_driver(byte_count, aggregated_time, stats_accumulator)
+    data_selection_results = data_selection.run_data_selection_driver(byte_count, aggregated_time, stats_accumulator,
+                                                                      byte_count_arrays=normalization_data['byte_count_arrays'])
 
     configs = {
         'all_data': [True, False], # True is all data, False is max flow only
@@ -217,6 +221,10 @@ def run_all_configs_analysis(base_path, save_plots=False):
     print("\n" + "="*60)
     i = 0
 
+    # Throughput binning only depends on the data selection and bin size (artifact filtering runs afterwards),
+    # so cache the driver output per (data selection, bin size) and reuse it across artifact filter options
+    throughput_cache = {}
+
     # 3-22 note: we have now flipped to do binning -> artifact filtering
     for data_selection_option in configs['all_data']:
         for artifact_filter_option in configs['artifact_filter']:
@@ -234,8 +242,19 @@ def run_all_configs_analysis(base_path, save_plots=False):
                 config_accumulator.add('bin_size_ms', bin_size_option)
 
                 # Step 1 and 2Throughput Calculation / Binning ----------------------------------
-                print(f"Running throughput calculation driver for configuration {i}")
-                all_throughput_data = tp_calc.run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size_option, data_selection_option, stats_accumulator, config_accumulator)
+                cache_key = (data_selection_option, bin_size_option)
+                if cache_key not in throughput_cache:
+                    print(f"Running throughput calculation driver for configuration {i}")
+                    # Collect the driver's per-configuration statistics separately so they can be replayed on a cache hit
+                    driver_accumulator = StatisticsAccumulator(base_path)
+                    all_throughput_data = tp_calc.run_throughput_calculation_driver(byte_count, aggregated_time, begin_time, bin_size_option, data_selection_option, stats_accumulator, driver_accumulator,
+                                                                                    byte_count_arrays=normalization_data['byte_count_arrays'])
+                    throughput_cache[cache_key] = (all_throughput_data, driver_accumulator.summary_stats)
+                else:
+                    print(f"Reusing throughput calculation for configuration {i}")
+
+                all_throughput_data, driver_stats = throughput_cache[cache_key]
+                config_accumulator.add_bulk(driver_stats)
 
                 # Step 3: Artifact Filtering ----------------------------------------------------
                 strict_interval_throughput_results = artifact.run_artifact_filter(
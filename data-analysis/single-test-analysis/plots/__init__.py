@@ -23,7 +23,24 @@ from .plot_sorted_throughput import (
 
 from .plotting_utilities import (
     ensure_plot_dir,
-    save_figure
+    save_figure,
+    plot_count_segments,
+    rema,
+    plot_stream_gantt,
+    combine_throughput_by_count,
+    plot_socket_gantt,
+    downsample_lttb,
+    socket_color_map,
+    get_socket_colors,
+    get_throughput_records,
+    rema_many,
+    count_colors_rgba,
+    colormap_colors,
+    stream_times_sec,
+    get_stream_times_sec,
+    scatter_by_count,
+    get_combined_throughput,
+    prepare_plot_data
 )
 
 from .plot_heatmap_throughput import (
@@ -57,6 +74,23 @@ __all__ = [
 
     'ensure_plot_dir',
     'save_figure',
+    'plot_count_segments',
+    'rema',
+    'plot_stream_gantt',
+    'combine_throughput_by_count',
+    'plot_socket_gantt',
+    'downsample_lttb',
+    'socket_color_map',
+    'get_socket_colors',
+    'get_throughput_records',
+    'rema_many',
+    'count_colors_rgba',
+    'colormap_colors',
+    'stream_times_sec',
+    'get_stream_times_sec',
+    'scatter_by_count',
+    'get_combined_throughput',
+    'prepare_plot_data',
 
     'load_byte_count_heatmap',
     'create_heatmap',
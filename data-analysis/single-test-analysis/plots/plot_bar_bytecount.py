@@ -14,11 +14,24 @@ import json
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import PolyCollection
 import argparse
 import os
+from types import MappingProxyType
 from . import plotting_utilities
 
 
+# Colors for different flow counts (cool to warm gradient), built once at import
+_FLOW_COLORS = MappingProxyType({
+    0: '#CCCCCC',  # Gray for no flows
+    1: '#0000FF',  # Blue
+    2: '#00BFFF',  # DeepSkyBlue
+    3: "#00B100",  # Green
+    4: '#FFD700',  # Gold
+    5: '#FF8C00',  # DarkOrange
+    6: '#FF0000',  # Red
+})
+
 
 def load_byte_count(file_path):
     """Load byte_count data from JSON file."""
@@ -48,47 +61,29 @@ def create_bytecount_bar_chart(byte_count, begin_time=None, title=None, save_pat
 
     max_flows = max(byte_count[ts][1] for ts in timestamps if byte_count[ts][1] > 0)
 
-    # Define colors for different flow counts (cool to warm gradient)
-    flow_colors = {
-        0: '#CCCCCC',  # Gray for no flows
-        1: '#0000FF',  # Blue
-        2: '#00BFFF',  # DeepSkyBlue
-        3: "#00B100",  # Green
-        4: '#FFD700',  # Gold
-        5: '#FF8C00',  # DarkOrange
-        6: '#FF0000',  # Red
-    }
-
-    # Extend color mapping if needed
-    if max_flows > 6:
-        colors = plt.cm.coolwarm(np.linspace(0, 1, max_flows + 1))
-        for i in range(max_flows + 1):
-            flow_colors[i] = colors[i]
-
-    # Prepare data for plotting
-    bar_positions = []  # Start time of each interval
-    bar_widths = []     # Duration of each interval (in seconds)
-    bar_heights = []    # Bytes transferred
-    bar_colors = []     # Color based on flow count
+    flow_colors = _FLOW_COLORS
 
-    for i in range(len(timestamps) - 1):
-        current_ts = timestamps[i]
-        next_ts = timestamps[i + 1]
+    # Extend color mapping if needed (the colormap replaces every entry from 0 to max_flows)
+    if max_flows > 6:
+        colors = plotting_utilities.colormap_colors('coolwarm', max_flows + 1)
+        flow_colors = dict(enumerate(colors))
 
-        start_time = (current_ts - begin_time) / 1000  # Convert to seconds
-        end_time = (next_ts - begin_time) / 1000
-        interval_width = end_time - start_time
+    # Prepare data for plotting - one bar per interval between consecutive timestamps
+    ts = np.fromiter(timestamps, dtype=np.int64, count=len(timestamps))
+    interval_starts = (ts[:-1] - begin_time) / 1000  # Convert to seconds
+    interval_ends = (ts[1:] - begin_time) / 1000
 
-        # Apply max_time filter if specified
-        if max_time is not None and start_time > max_time:
-            break
+    # Apply max_time filter if specified (timestamps are sorted, so this keeps a prefix of the intervals)
+    num_bars = len(interval_starts)
+    if max_time is not None:
+        num_bars = np.searchsorted(interval_starts, max_time, side='right')
 
-        bytes_val, flow_count = byte_count[current_ts]
+    counts = np.array([byte_count[current_ts] for current_ts in timestamps[:num_bars]], dtype=np.int64).reshape(-1, 2)
 
-        bar_positions.append(start_time)
-        bar_widths.append(interval_width)
-        bar_heights.append(bytes_val)
-        bar_colors.append(flow_colors.get(flow_count, '#CCCCCC'))
+    bar_positions = interval_starts[:num_bars]                           # Start time of each interval
+    bar_widths = interval_ends[:num_bars] - interval_starts[:num_bars]   # Duration of each interval (in seconds)
+    bar_heights = counts[:, 0]                                           # Bytes transferred
+    bar_colors = plotting_utilities.count_colors_rgba(counts[:, 1], flow_colors, default='#CCCCCC')  # Color based on flow count
 
     # Create the plot with subplots if source_times provided
     if source_times:
@@ -96,9 +91,18 @@ def create_bytecount_bar_chart(byte_count, begin_time=None, title=None, save_pat
     else:
         fig, ax = plt.subplots(figsize=(14, 6))
 
-    # Create bars
-    bars = ax.bar(bar_positions, bar_heights, width=bar_widths,
-                  color=bar_colors, align='edge', edgecolor='black', linewidth=0.5)
+    # Create bars - all bars are one PolyCollection of rectangles instead of one Rectangle patch per bar
+    bar_lefts = bar_positions
+    bar_rights = bar_positions + bar_widths
+    bar_bottoms = np.zeros(num_bars)
+    bar_vertices = np.stack([np.column_stack([bar_lefts, bar_bottoms]),
+                             np.column_stack([bar_lefts, bar_heights]),
+                             np.column_stack([bar_rights, bar_heights]),
+                             np.column_stack([bar_rights, bar_bottoms])], axis=1)
+    bars = PolyCollection(bar_vertices, facecolors=bar_colors, edgecolors='black', linewidths=0.5)
+    bars.sticky_edges.y.append(0)  # Like ax.bar, keep the y-axis starting at 0
+    ax.add_collection(bars)
+    ax.autoscale_view()
 
     # Customize axes
     ax.set_xlabel('Time (seconds)', fontsize=12)
@@ -131,44 +135,7 @@ def create_bytecount_bar_chart(byte_count, begin_time=None, title=None, save_pat
 
     # Add HTTP Stream Gantt Chart if source_times is provided
     if source_times:
-        # Create color map for unique socket IDs
-        unique_sockets = set(info['socket'] for info in source_times.values() if info['socket'] is not None)
-        colors = plt.cm.rainbow(np.linspace(0, 1, len(unique_sockets)))
-        socket_colors = dict(zip(unique_sockets, colors))
-
-        # Track which socket IDs we've already added to the legend
-        legend_added = set()
-
-        # Plot flow durations on the Gantt chart
-        y_offset = 0
-        for stream_id, info in source_times.items():
-            start_sec = (info['times'][0] - begin_time) / 1000
-            end_sec = (info['times'][1] - begin_time) / 1000
-
-            # Choose color based on socket ID
-            if info['socket'] is not None:
-                color = socket_colors[info['socket']]
-                label = f'Socket {info["socket"]}'
-
-                # Only add to legend if we haven't seen this socket ID before
-                if info['socket'] not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label=label)
-                    legend_added.add(info['socket'])
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-            else:
-                color = 'gray'
-                if 'no_socket' not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label='No Socket')
-                    legend_added.add('no_socket')
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-
-            y_offset += 1
+        socket_handles, socket_labels = plotting_utilities.plot_stream_gantt(ax2, source_times, begin_time)
 
         # Add labels, legend, and grid for the Gantt chart
         ax2.set_xlabel('Time (seconds)', fontsize=12)
@@ -176,7 +143,7 @@ def create_bytecount_bar_chart(byte_count, begin_time=None, title=None, save_pat
         ax2.set_yticks(range(len(source_times)))
         ax2.set_yticklabels([f'Stream {id}' for id in source_times.keys()], fontsize=8)
         ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
-        ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
         # Align the x-axes of both plots
         ax.set_xlim(ax2.get_xlim())
@@ -1,6 +1,79 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.lines import Line2D
+from . import plotting_utilities
+
+
+
+def _stream_bytecounts(progress, test_type, begin_time):
+    """
+    Convert one HTTP stream's progress list into time-sorted NumPy arrays, summing bytecounts that share a timestamp.
+
+    Args:
+        progress (list): The stream's progress entries ({'time', 'bytecount'} or {'time', 'current_position'})
+        test_type (str): "upload" or "download"
+        begin_time (int): Start time in milliseconds, download timestamps are normalized to seconds from it
+
+    Returns:
+        tuple: (times, bytecounts) ndarrays, one entry per unique timestamp
+    """
+    num_items = len(progress)
+    if num_items == 0:
+        return np.empty(0), np.empty(0)
+
+    if test_type == "upload":
+        times = np.fromiter((float(item['time']) for item in progress), dtype=float, count=num_items)
+        # For upload, check if data is already normalized (has 'bytecount') or raw (has 'current_position')
+        if 'bytecount' in progress[0]:
+            bytecounts = np.fromiter((item.get('bytecount', 0) for item in progress), dtype=float, count=num_items)
+        else:
+            # Data is raw current_position data, the difference between positions is the bytecount
+            positions = np.fromiter((item.get('current_position', 0) for item in progress), dtype=float, count=num_items)
+            bytecounts = np.diff(positions, prepend=0)
+    else:
+        # For download, normalize timestamps from milliseconds to seconds relative to begin_time
+        times = (np.fromiter((int(item['time']) for item in progress), dtype=np.int64, count=num_items) - begin_time) / 1000.0
+        bytecounts = np.fromiter((item.get('bytecount', 0) for item in progress), dtype=float, count=num_items)
+
+    # Combine bytecounts with the same timestamp (np.unique also returns the times sorted)
+    unique_times, inverse = np.unique(times, return_inverse=True)
+    return unique_times, np.bincount(inverse, weights=bytecounts)
+
+
+def _earliest_progress_time(byte_list):
+    """
+    Find the earliest progress timestamp across all HTTP streams (the download begin_time fallback)
+    with one array reduction instead of collecting every time into a Python list.
+
+    Returns:
+        int: Earliest timestamp in milliseconds, 0 if there is no progress data
+    """
+    num_items = sum(len(entry['progress']) for entry in byte_list)
+    if num_items == 0:
+        return 0
+    all_times = np.fromiter((int(item['time']) for entry in byte_list for item in entry['progress']),
+                            dtype=np.int64, count=num_items)
+    return int(all_times.min())
+
+
+def _get_stream_bytecounts(plot_data, test_type, begin_time):
+    """
+    Get every stream's (times, bytecounts) arrays, parsing the progress lists only once per test and caching
+    them on plot_data so the per-stream and aggregated plots (and re-plots) reuse the same arrays.
+
+    Returns:
+        list: [(stream_id, times, bytecounts), ...] in byte_list order
+    """
+    cached_streams = plot_data.setdefault('stream_bytecounts', {})
+    if (test_type, begin_time) not in cached_streams:
+        cached_streams[(test_type, begin_time)] = [
+            (entry['id'],) + _stream_bytecounts(entry['progress'], test_type, begin_time)
+            for entry in plot_data["byte_list"]
+        ]
+    return cached_streams[(test_type, begin_time)]
 
 
 """
@@ -29,8 +102,6 @@ def plot_aggregated_bytecount(plot_data, test_type=None, title=None, log_scale=F
     if test_type is None:
         test_type = plot_data.get("test_type")
 
-    stream_data = {}
-
     # Auto-detect test type if not provided
     if test_type is None:
         # Check if data has 'current_position' field (upload) or 'bytecount' field (download)
@@ -43,82 +114,30 @@ def plot_aggregated_bytecount(plot_data, test_type=None, title=None, log_scale=F
 
     # For download tests, find begin_time if not provided
     if test_type == "download" and begin_time is None:
-        all_times = []
-        for entry in data:
-            for item in entry['progress']:
-                all_times.append(int(item['time']))
-        begin_time = min(all_times) if all_times else 0
+        begin_time = _earliest_progress_time(data)
         print(f"Auto-detected begin_time for download normalization: {begin_time}")
 
-    # Process each stream to get individual stream data
-    for entry in data:
-        stream_id = entry['id']
-        progress = entry['progress']
-
-        # Combine bytecounts with the same timestamp
-        combined_data = {}
-
-        if test_type == "upload":
-            # For upload, check if data is already normalized (has 'bytecount') or raw (has 'current_position')
-            if 'bytecount' in progress[0]:
-                # Data is already normalized from normalize_current_position_list
-                for item in progress:
-                    timestamp = float(item['time'])
-                    bytecount = item.get('bytecount', 0)
-                    if timestamp in combined_data:
-                        combined_data[timestamp] += bytecount
-                    else:
-                        combined_data[timestamp] = bytecount
-            else:
-                # Data is raw current_position data, convert to bytecounts
-                prev_position = 0
-                for item in progress:
-                    timestamp = float(item['time'])
-                    current_position = item.get('current_position', 0)
-                    bytecount = current_position - prev_position
-                    prev_position = current_position
-
-                    if timestamp in combined_data:
-                        combined_data[timestamp] += bytecount
-                    else:
-                        combined_data[timestamp] = bytecount
-        else:
-            # For download, use existing bytecounts and normalize timestamps
-            for item in progress:
-                # Normalize timestamp: convert from milliseconds to seconds relative to begin_time
-                timestamp = (int(item['time']) - begin_time) / 1000.0
-                bytecount = item.get('bytecount', 0)
-                if timestamp in combined_data:
-                    combined_data[timestamp] += bytecount
-                else:
-                    combined_data[timestamp] = bytecount
-
-        df = pd.DataFrame(list(combined_data.items()), columns=['time', 'bytecount'])
-        df.sort_values(by='time', inplace=True)  # Ensure data is sorted by time
-        df['rema'] = df['bytecount'].ewm(alpha=0.1, adjust=False).mean()  # Calculate REMA
-
-        # Store the processed DataFrame for the stream ID
-        stream_data[stream_id] = df
+    # Get each stream's time-sorted (times, bytecounts) arrays
+    stream_data = [(times, bytecounts) for _, times, bytecounts in _get_stream_bytecounts(plot_data, test_type, begin_time)
+                   if len(times) > 0]
 
     # Create aggregated data by summing bytecounts across all streams at each timestamp
-    all_timestamps = set()
-    for df in stream_data.values():
-        all_timestamps.update(df['time'].values)
-
-    aggregated_data = {}
-    for timestamp in all_timestamps:
-        total_bytecount = 0
-        for df in stream_data.values():
-            # Find the closest timestamp in this stream's data
-            closest_idx = (df['time'] - timestamp).abs().idxmin()
-            if abs(df.loc[closest_idx, 'time'] - timestamp) < 0.1:  # Within 0.1 seconds
-                total_bytecount += df.loc[closest_idx, 'bytecount']
-        aggregated_data[timestamp] = total_bytecount
-
-    # Create DataFrame for aggregated data
-    aggregated_df = pd.DataFrame(list(aggregated_data.items()), columns=['time', 'bytecount'])
-    aggregated_df.sort_values(by='time', inplace=True)
-    aggregated_df['rema'] = aggregated_df['bytecount'].ewm(alpha=0.1, adjust=False).mean()
+    all_timestamps = np.unique(np.concatenate([times for times, _ in stream_data])) if stream_data else np.empty(0)
+
+    aggregated_bytecounts = np.zeros(len(all_timestamps))
+    for times, bytecounts in stream_data:
+        # Find the closest timestamp in this stream's data, from its neighbors on either side (ties go to the earlier one)
+        insert_idx = np.searchsorted(times, all_timestamps)
+        left = np.clip(insert_idx - 1, 0, len(times) - 1)
+        right = np.clip(insert_idx, 0, len(times) - 1)
+        closest_idx = np.where(np.abs(times[left] - all_timestamps) <= np.abs(times[right] - all_timestamps), left, right)
+
+        within = np.abs(times[closest_idx] - all_timestamps) < 0.1  # Within 0.1 seconds
+        aggregated_bytecounts += np.where(within, bytecounts[closest_idx], 0)
+
+    # Create DataFrame for aggregated data (np.unique already sorted the timestamps)
+    aggregated_df = pd.DataFrame({'time': all_timestamps, 'bytecount': aggregated_bytecounts})
+    aggregated_df['rema'] = plotting_utilities.rema(aggregated_df['bytecount'])
 
     # Create figure with subplots - add Gantt chart if source_times is provided
     if source_times:
@@ -148,44 +167,7 @@ def plot_aggregated_bytecount(plot_data, test_type=None, title=None, log_scale=F
     # Add HTTP Stream Gantt Chart if source_times is provided
     if source_times:
         # ------------------- HTTP Streams Gantt Chart (Bottom Subplot) -------------------
-        # Create color map for unique socket IDs
-        unique_sockets = set(info['socket'] for info in source_times.values() if info['socket'] is not None)
-        colors = plt.cm.rainbow(np.linspace(0, 1, len(unique_sockets)))
-        socket_colors = dict(zip(unique_sockets, colors))
-
-        # Track which socket IDs we've already added to the legend
-        legend_added = set()
-
-        # Plot flow durations on the Gantt chart
-        y_offset = 0
-        for stream_id, info in source_times.items():
-            start_sec = (info['times'][0] - begin_time) / 1000
-            end_sec = (info['times'][1] - begin_time) / 1000
-
-            # Choose color based on socket ID
-            if info['socket'] is not None:
-                color = socket_colors[info['socket']]
-                label = f'Socket {info["socket"]}'
-
-                # Only add to legend if we haven't seen this socket ID before
-                if info['socket'] not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label=label)
-                    legend_added.add(info['socket'])
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-            else:
-                color = 'gray'
-                if 'no_socket' not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label='No Socket')
-                    legend_added.add('no_socket')
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-
-            y_offset += 1
+        socket_handles, socket_labels = plotting_utilities.plot_stream_gantt(ax2, source_times, begin_time)
 
         # Add labels, legend, and grid for the Gantt chart
         ax2.set_xlabel('Time (seconds)')
@@ -193,7 +175,7 @@ def plot_aggregated_bytecount(plot_data, test_type=None, title=None, log_scale=F
         ax2.set_yticks(range(len(source_times)))
         ax2.set_yticklabels([f'Stream {id}' for id in source_times.keys()], fontsize=8)
         ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
-        ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
         # Align the x-axes of both plots
         ax_agg.set_xlim(ax2.get_xlim())
@@ -244,62 +226,16 @@ def plot_rema_per_http_stream(plot_data, test_type=None, title=None, log_scale=F
 
     # For download tests, find begin_time if not provided
     if test_type == "download" and begin_time is None:
-        all_times = []
-        for entry in data:
-            for item in entry['progress']:
-                all_times.append(int(item['time']))
-        begin_time = min(all_times) if all_times else 0
+        begin_time = _earliest_progress_time(data)
         print(f"Auto-detected begin_time for download normalization: {begin_time}")
 
     # for each stream...
-    for entry in data:
-        stream_id = entry['id']
-        progress = entry['progress']
-
-        # Combine bytecounts with the same timestamp
-        combined_data = {}
-
-        if test_type == "upload":
-            # For upload, check if data is already normalized (has 'bytecount') or raw (has 'current_position')
-            if 'bytecount' in progress[0]:
-                # Data is already normalized from normalize_current_position_list
-                for item in progress:
-                    timestamp = float(item['time'])
-                    bytecount = item.get('bytecount', 0)
-                    if timestamp in combined_data:
-                        combined_data[timestamp] += bytecount
-                    else:
-                        combined_data[timestamp] = bytecount
-            else:
-                # Data is raw current_position data, convert to bytecounts
-                prev_position = 0
-                for item in progress:
-                    timestamp = float(item['time'])
-                    current_position = item.get('current_position', 0)
-                    bytecount = current_position - prev_position
-                    prev_position = current_position
-
-                    if timestamp in combined_data:
-                        combined_data[timestamp] += bytecount
-                    else:
-                        combined_data[timestamp] = bytecount
-        else:
-            # For download, use existing bytecounts and normalize timestamps
-            for item in progress:
-                # Normalize timestamp: convert from milliseconds to seconds relative to begin_time
-                timestamp = (int(item['time']) - begin_time) / 1000.0
-                bytecount = item.get('bytecount', 0)
-                if timestamp in combined_data:
-                    combined_data[timestamp] += bytecount
-                else:
-                    combined_data[timestamp] = bytecount
-
-        df = pd.DataFrame(list(combined_data.items()), columns=['time', 'bytecount'])
-        df.sort_values(by='time', inplace=True)  # Ensure data is sorted by time
-        df['rema'] = df['bytecount'].ewm(alpha=0.1, adjust=False).mean()  # Calculate REMA
-
-        # Store the processed DataFrame for the stream ID
-        stream_data[stream_id] = df
+    stream_bytecounts = _get_stream_bytecounts(plot_data, test_type, begin_time)
+
+    # Smooth every stream in one pass, then store the processed times and REMA for each stream ID
+    stream_remas = plotting_utilities.rema_many([bytecounts for _, _, bytecounts in stream_bytecounts])
+    for (stream_id, times, _), rema in zip(stream_bytecounts, stream_remas):
+        stream_data[stream_id] = (times, rema)
 
     # Create figure with subplots - add Gantt chart if source_times is provided
     if source_times:
@@ -307,11 +243,18 @@ def plot_rema_per_http_stream(plot_data, test_type=None, title=None, log_scale=F
     else:
         fig, ax1 = plt.subplots(figsize=(12, 8))
 
-    # Plot REMA lines for each source ID and store the line objects
-    lines = {}
-    for stream_id, df in stream_data.items():
-        line, = ax1.plot(df['time'], df['rema'], label=f"Stream {stream_id}")
-        lines[stream_id] = line
+    # Plot every stream's REMA line as one LineCollection, colored with the default line color cycle
+    stream_ids = list(stream_data.keys())
+    cycle_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    stream_colors = to_rgba_array([cycle_colors[i % len(cycle_colors)] for i in range(len(stream_ids))])
+    rema_lines = LineCollection([np.column_stack(stream_data[stream_id]) for stream_id in stream_ids],
+                                colors=stream_colors, linewidths=plt.rcParams['lines.linewidth'])
+    ax1.add_collection(rema_lines)
+    ax1.autoscale_view()
+
+    # One proxy legend entry per stream, since the collection itself is a single artist
+    legend_handles = [Line2D([], [], color=color, label=f"Stream {stream_id}")
+                      for stream_id, color in zip(stream_ids, stream_colors)]
 
     if log_scale:
         ax1.set_yscale('log') # set to log... this is just for experimenting, it is mostly helpful to NOT have a log scale
@@ -325,18 +268,25 @@ def plot_rema_per_http_stream(plot_data, test_type=None, title=None, log_scale=F
         ax1.set_title(f'REMA Lines for Each HTTP Stream ({test_type.title()} Test)')
 
     # Create an interactive legend
-    legend = ax1.legend(loc='upper right', bbox_to_anchor=(1.15, 1), fontsize='small', title="Streams")
+    legend = ax1.legend(handles=legend_handles, loc='upper right', bbox_to_anchor=(1.15, 1), fontsize='small', title="Streams")
     legend_lines = legend.get_lines()
 
     # Add interactivity to the legend -  click on the legend to toggle visibility of the corresponding line
     #Written with the help of Claude
+    # Map each legend entry to its stream's segment index once, so a click is a dict lookup instead of a scan over every stream
+    legend_to_index = {legend_line: i for i, legend_line in enumerate(legend_lines)}
+    visible_streams = np.ones(len(stream_ids), dtype=bool)
+
     def on_legend_click(event):
-        for legend_line, (stream_id, line) in zip(legend_lines, lines.items()):
-            if event.artist == legend_line:
-                visible = not line.get_visible()
-                line.set_visible(visible)  # Toggle visibility
-                legend_line.set_alpha(1.0 if visible else 0.2)  # Dim the legend entry if hidden
-                fig.canvas.draw()
+        i = legend_to_index.get(event.artist)
+        if i is None:
+            return
+        visible_streams[i] = not visible_streams[i]
+        # Hide a stream by making its segment fully transparent
+        stream_colors[i, 3] = 1.0 if visible_streams[i] else 0.0
+        rema_lines.set_color(stream_colors)  # Toggle visibility
+        event.artist.set_alpha(1.0 if visible_streams[i] else 0.2)  # Dim the legend entry if hidden
+        fig.canvas.draw_idle()  # Coalesce redraws instead of forcing a full synchronous draw per click
 
     # Connect the legend click event to the toggle function
     fig.canvas.mpl_connect('pick_event', on_legend_click)
@@ -347,44 +297,7 @@ def plot_rema_per_http_stream(plot_data, test_type=None, title=None, log_scale=F
     # Add HTTP Stream Gantt Chart if source_times is provided
     if source_times:
         # ------------------- HTTP Streams Gantt Chart (Bottom Subplot) -------------------
-        # Create color map for unique socket IDs
-        unique_sockets = set(info['socket'] for info in source_times.values() if info['socket'] is not None)
-        colors = plt.cm.rainbow(np.linspace(0, 1, len(unique_sockets)))
-        socket_colors = dict(zip(unique_sockets, colors))
-
-        # Track which socket IDs we've already added to the legend
-        legend_added = set()
-
-        # Plot flow durations on the Gantt chart
-        y_offset = 0
-        for stream_id, info in source_times.items():
-            start_sec = (info['times'][0] - begin_time) / 1000
-            end_sec = (info['times'][1] - begin_time) / 1000
-
-            # Choose color based on socket ID
-            if info['socket'] is not None:
-                color = socket_colors[info['socket']]
-                label = f'Socket {info["socket"]}'
-
-                # Only add to legend if we haven't seen this socket ID before
-                if info['socket'] not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label=label)
-                    legend_added.add(info['socket'])
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-            else:
-                color = 'gray'
-                if 'no_socket' not in legend_added:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2, label='No Socket')
-                    legend_added.add('no_socket')
-                else:
-                    ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                              color=color, linewidth=2)
-
-            y_offset += 1
+        socket_handles, socket_labels = plotting_utilities.plot_stream_gantt(ax2, source_times, begin_time)
 
         # Add labels, legend, and grid for the Gantt chart
         ax2.set_xlabel('Time (seconds)')
@@ -392,7 +305,7 @@ def plot_rema_per_http_stream(plot_data, test_type=None, title=None, log_scale=F
         ax2.set_yticks(range(len(source_times)))
         ax2.set_yticklabels([f'Stream {id}' for id in source_times.keys()], fontsize=8)
         ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
-        ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
         # Align the x-axes of both plots
         ax1.set_xlim(ax2.get_xlim())
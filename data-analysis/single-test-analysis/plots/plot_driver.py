@@ -20,6 +20,9 @@ def run_plot_driver(plot_data):
     print("Generating plots...")
     print("Saving to:", plot_data["base_path"])
 
+    # Convert the stream times and throughput lists to arrays once, shared by every plot below
+    plots.prepare_plot_data(plot_data)
+
     # Threshold interval throughput plots
     # Uncomment the plotsto generate:
     # plots.plot_throughput_and_http_streams(plot_data)
@@ -19,10 +19,11 @@ import os
 import sys
 
 import utilities
+import data_normalization as data_norm
 import dimension_throughput_calc as tp_calc
 
 def plot_sorted_throughput(throughput_results, title=None, save_path=None,
-                           show_jumps=True, jump_threshold=None):
+                           show_jumps=True, jump_threshold=None, show=True):
     """
     Plot throughput values in sorted order to visualize distribution and jumps.
 
@@ -32,6 +33,7 @@ def plot_sorted_throughput(throughput_results, title=None, save_path=None,
         save_path: Optional path to save figure
         show_jumps: Whether to highlight large jumps in the sorted values
         jump_threshold: Threshold for detecting jumps (Mbps). If None, uses adaptive threshold
+        show: Whether to call plt.show() (set False to show several figures with one call)
     """
     if not throughput_results:
         print("Error: No throughput data to plot")
@@ -80,11 +82,11 @@ def plot_sorted_throughput(throughput_results, title=None, save_path=None,
                 label=f'Mean ± Std: [{mean_tp-std_tp:.2f}, {mean_tp+std_tp:.2f}] Mbps', alpha=0.7)
     ax1.axhline(mean_tp - std_tp, color='orange', linestyle=':', linewidth=1.5, alpha=0.7)
 
-    # Highlight jumps
+    # Highlight jumps - one full-height line collection and one scatter for all jumps
     if show_jumps and len(jump_indices) > 0:
-        for jump_idx in jump_locations:
-            ax1.axvline(jump_idx, color='red', linestyle=':', linewidth=1, alpha=0.5)
-            ax1.scatter(jump_idx, sorted_throughputs[jump_idx], s=5, color='blue', zorder=5)
+        ax1.vlines(jump_locations, 0, 1, transform=ax1.get_xaxis_transform(),
+                   color='red', linestyle=':', linewidth=1, alpha=0.5)
+        ax1.scatter(jump_locations, np.asarray(sorted_throughputs)[jump_locations], s=5, color='blue', zorder=5)
 
     ax1.set_xlabel('Index (sorted)', fontsize=12)
     ax1.set_ylabel('Throughput (Mbps)', fontsize=12)
@@ -109,11 +111,10 @@ def plot_sorted_throughput(throughput_results, title=None, save_path=None,
 
         ax2.bar(diff_indices, diffs, width=1.0, color='steelblue', alpha=0.7, edgecolor='black', linewidth=0.5)
 
-        # Highlight large jumps
+        # Highlight large jumps (one bar call for all of them)
         if show_jumps and len(jump_indices) > 0:
-            for jump_idx in jump_indices:
-                ax2.bar(jump_idx, diffs[jump_idx], width=1.0, color='red',
-                       alpha=0.8, edgecolor='darkred', linewidth=1.5)
+            ax2.bar(jump_indices, diffs[jump_indices], width=1.0, color='red',
+                   alpha=0.8, edgecolor='darkred', linewidth=1.5)
 
         # Add threshold line if jumps are shown
         if show_jumps:
@@ -139,7 +140,8 @@ def plot_sorted_throughput(throughput_results, title=None, save_path=None,
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
         print(f"\nPlot saved to: {save_path}")
 
-    plt.show()
+    if show:
+        plt.show()
 
     return {
         'sorted_throughputs': sorted_throughputs,
@@ -154,7 +156,7 @@ def plot_sorted_throughput(throughput_results, title=None, save_path=None,
 
 
 def plot_throughput_histogram_with_jumps(throughput_results, jump_info=None,
-                                        title=None, save_path=None, bins=50):
+                                        title=None, save_path=None, bins=50, show=True):
     """
     Plot histogram of throughput values with jump locations marked.
 
@@ -164,17 +166,23 @@ def plot_throughput_histogram_with_jumps(throughput_results, jump_info=None,
         title: Optional plot title
         save_path: Optional path to save figure
         bins: Number of histogram bins
+        show: Whether to call plt.show() (set False to show several figures with one call)
     """
     if not throughput_results:
         print("Error: No throughput data to plot")
         return
 
-    throughputs = [d['throughput'] for d in throughput_results]
+    # Reuse the values already extracted by plot_sorted_throughput if available (the histogram does not depend on order)
+    if jump_info and jump_info.get('sorted_throughputs') is not None:
+        throughputs = np.asarray(jump_info['sorted_throughputs'], dtype=float)
+    else:
+        throughputs = np.fromiter((d['throughput'] for d in throughput_results), dtype=float, count=len(throughput_results))
 
     fig, ax = plt.subplots(figsize=(14, 6))
 
-    # Create histogram
-    n, bins_edges, patches = ax.hist(throughputs, bins=bins, color='steelblue',
+    # Create histogram, with the bin edges computed once up front
+    bin_edges = np.histogram_bin_edges(throughputs, bins=bins)
+    n, bins_edges, patches = ax.hist(throughputs, bins=bin_edges, color='steelblue',
                                      alpha=0.7, edgecolor='black', linewidth=0.5)
 
     # Add statistics
@@ -191,13 +199,11 @@ def plot_throughput_histogram_with_jumps(throughput_results, jump_info=None,
         sorted_throughputs = jump_info['sorted_throughputs']
         jump_indices = jump_info['jump_indices']
 
-        for jump_idx in jump_indices:
-            jump_value = sorted_throughputs[jump_idx + 1]
-            ax.axvline(jump_value, color='orange', linestyle=':', linewidth=2, alpha=0.7)
-
-        # Add legend entry for jumps
+        # All jump markers are one full-height line collection, which also carries the legend entry
         if len(jump_indices) > 0:
-            ax.axvline(0, color='orange', linestyle=':', linewidth=2, alpha=0.7,
+            jump_values = np.asarray(sorted_throughputs)[np.asarray(jump_indices) + 1]
+            ax.vlines(jump_values, 0, 1, transform=ax.get_xaxis_transform(),
+                      color='orange', linestyle=':', linewidth=2, alpha=0.7,
                       label=f'Jump Locations ({len(jump_indices)})')
 
     ax.set_xlabel('Throughput (Mbps)', fontsize=12)
@@ -215,7 +221,8 @@ def plot_throughput_histogram_with_jumps(throughput_results, jump_info=None,
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
         print(f"Histogram saved to: {save_path}")
 
-    plt.show()
+    if show:
+        plt.show()
 
 
 def main():
@@ -242,32 +249,44 @@ def main():
 
     args = parser.parse_args()
 
-    # Load data
+    # Load data, preferring the byte_count.npz arrays cached by the normalization driver (no JSON parsing or dict building)
+    byte_count_cache = os.path.join(args.test_path, "byte_count.npz")
     byte_count_file = os.path.join(args.test_path, "byte_count.json")
 
-    if not os.path.exists(byte_count_file):
-        print(f"Error: byte_count.json not found in {args.test_path}")
-        return
-
-    print(f"Loading byte_count from: {byte_count_file}")
-    byte_count_raw = utilities.load_json(byte_count_file)
-    byte_count = {int(timestamp): value for timestamp, value in byte_count_raw.items()}
+    # The arrays are only used if they were built from the current byte_count.json (the driver stores its modification time)
+    byte_count = None
+    if os.path.exists(byte_count_cache) and os.path.exists(byte_count_file):
+        try:
+            with np.load(byte_count_cache) as cached:
+                if float(cached['byte_count_mtime']) == os.path.getmtime(byte_count_file):
+                    print(f"Loading byte_count from: {byte_count_cache}")
+                    byte_count = data_norm.ByteCount(cached['times'], cached['sums'], cached['counts'])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not read {byte_count_cache}, ignoring it: {e}")
+
+    if byte_count is None:
+        if not os.path.exists(byte_count_file):
+            print(f"Error: byte_count.json not found in {args.test_path}")
+            return
+        print(f"Loading byte_count from: {byte_count_file}")
+        byte_count_raw = utilities.load_json(byte_count_file)
+        byte_count = data_norm.byte_count_arrays({int(timestamp): value for timestamp, value in byte_count_raw.items()})
 
     # Get aggregated timestamps and begin_time
-    timestamps = sorted(byte_count.keys())
-    begin_time = timestamps[0]
+    timestamps = byte_count.times
+    begin_time = int(timestamps[0])
 
     # Determine num_flows
     if args.num_flows is None:
-        num_flows = max(byte_count[ts][1] for ts in timestamps if byte_count[ts][1] > 0)
+        num_flows = int(byte_count.counts.max())
         print(f"Auto-detected num_flows: {num_flows}")
     else:
         num_flows = args.num_flows
         print(f"Using specified num_flows: {num_flows}")
 
-    # Calculate throughput
+    # Calculate throughput with the same array kernels the main pipeline uses
     print(f"\nCalculating throughput with {args.threshold}ms interval threshold...")
-    throughput_results = tp_calc.calculate_interval_throughput(
+    throughput_results = tp_calc.calculate_interval_threshold_throughput(
         timestamps, byte_count, num_flows, args.threshold, begin_time
     )
 
@@ -291,7 +310,8 @@ def main():
         title=args.title,
         save_path=save_path_sorted,
         show_jumps=not args.no_jumps,
-        jump_threshold=args.jump_threshold
+        jump_threshold=args.jump_threshold,
+        show=False
     )
 
     # Create histogram if requested
@@ -302,9 +322,13 @@ def main():
             jump_info=jump_info if not args.no_jumps else None,
             title=args.title,
             save_path=save_path_hist,
-            bins=args.bins
+            bins=args.bins,
+            show=False
         )
 
+    # Show both figures with a single (blocking) call
+    plt.show()
+
     print("\nDone!")
 
 
@@ -12,9 +12,9 @@
 
 """
 
+from types import MappingProxyType
+
 import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
 
 
 # import ploting_utilities.py in the same directory
@@ -22,6 +22,26 @@ import pandas as pd
 import plots as plotting_utilities
 
 
+# Flow count -> color palettes, built once at import (read-only so one plot can't change another's colors)
+_FLOW_COLORS_BLUES = MappingProxyType({
+    1: "#9ecae1",
+    2: "#6baed6",
+    3: '#4292c6',
+    4: "#2171b5",
+    5: '#08519c',
+    6: "#08306b"
+})
+
+_FLOW_COLORS = MappingProxyType({
+    1: 'Blue',
+    2: 'DeepSkyBlue',
+    3: 'Green',
+    4: 'Gold',
+    5: 'DarkOrange',
+    6: 'Red'
+})
+
+
 """
 Builds two plots:
 1) A time series chart showing the throughput value over the duration of the test.
@@ -29,18 +49,19 @@ Builds two plots:
 """
 def plot_throughput_and_http_streams(plot_data, title=None):
     # Extract parameters from plot_data
-    df = pd.DataFrame(plot_data["throughput_results"])
+    records = plotting_utilities.get_throughput_records(plot_data, "throughput_results")
     source_times = plot_data["source_times"]
     begin_time = plot_data["begin_time"]
     save = plot_data["save"]
     base_path = plot_data["base_path"]
-    if 'throughput' in df.columns:
+    if len(records) > 0:
         # Create the figure with two subplots, stacked vertically
-        df['throughput_ema'] = df['throughput'].ewm(alpha=0.1, adjust=False).mean()
+        throughput_ema = plotting_utilities.rema(records['throughput'])
         fig, (ax1, ax2) = plt.subplots(2, 1, height_ratios=[3, 1], figsize=(10, 8))
 
-        # Plot throughput on the top subplot
-        ax1.plot(df['time'], df['throughput_ema'], color='red', linestyle='--')
+        # Plot throughput on the top subplot (long tests are downsampled, the line looks the same)
+        rema_time, rema_throughput = plotting_utilities.downsample_lttb(records['time'], throughput_ema)
+        ax1.plot(rema_time, rema_throughput, color='red', linestyle='--')
         ax1.set_xlabel('Time (seconds)')
         ax1.set_ylabel('Throughput (Mbps)')
         ax1.set_ylim(0, 5000) #set y-axis for consistency
@@ -57,53 +78,13 @@ def plot_throughput_and_http_streams(plot_data, title=None):
         ax1.legend()
 
         # -------------------  Sockets Gantt Chart (Bottom Subplot) - Grouped by Socket -------------------
-        # Group streams by socket ID
-        socket_groups = {}
-        for stream_id, info in source_times.items():
-            socket_id = info['socket'] if info['socket'] is not None else 'no_socket'
-            if socket_id not in socket_groups:
-                socket_groups[socket_id] = []
-            socket_groups[socket_id].append({
-                'stream_id': stream_id,
-                'start': (info['times'][0] - begin_time) / 1000,
-                'end': (info['times'][1] - begin_time) / 1000
-            })
-
-        # Create color map for unique socket IDs
-        unique_sockets = [s for s in socket_groups.keys() if s != 'no_socket']
-        colors = plt.cm.Paired(np.linspace(0, 1, len(unique_sockets)))
-        socket_colors = dict(zip(unique_sockets, colors))
-        socket_colors['no_socket'] = 'gray'
-
-        # Plot each socket group on its own row
-        y_offset = 0
-        sorted_sockets = sorted([s for s in socket_groups.keys() if s != 'no_socket']) + (['no_socket'] if 'no_socket' in socket_groups else [])
-
-        for socket_id in sorted_sockets:
-            streams = socket_groups[socket_id]
-            color = socket_colors[socket_id]
-
-            # Plot all streams for this socket on the same row
-            for stream in streams:
-                ax2.hlines(y=y_offset, xmin=stream['start'], xmax=stream['end'],
-                          color=color, linewidth=2)
-
-            y_offset += 1
+        socket_handles, socket_labels = plotting_utilities.plot_socket_gantt(ax2, source_times, begin_time, socket_colors=plotting_utilities.get_socket_colors(plot_data, plt.cm.Paired),
+            stream_times=plotting_utilities.get_stream_times_sec(plot_data))
 
         ax2.set_xlabel('Time (seconds)')
         ax2.set_ylabel('Socket ID')
-        ax2.set_yticks(range(len(sorted_sockets)))
-        ax2.set_yticklabels([f'Socket {s}' if s != 'no_socket' else 'No Socket' for s in sorted_sockets], fontsize=8)
         ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
 
-        # Create legend for sockets
-        socket_handles = []
-        socket_labels = []
-        for socket_id in sorted_sockets:
-            color = socket_colors[socket_id]
-            socket_handles.append(plt.Line2D([0], [0], color=color, lw=2))
-            socket_labels.append(f'Socket {socket_id}' if socket_id != 'no_socket' else 'No Socket')
-
         ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
         # Align the x-axes of both plots
@@ -126,33 +107,34 @@ Also includes a sockets Gantt chart below.
 """
 def plot_throughput_scatter_max_flows_only(plot_data, start_time=0, end_time=None, title=None):
     # Extract parameters from plot_data
-    df = pd.DataFrame(plot_data["throughput_results"])
+    records = plotting_utilities.get_throughput_records(plot_data, "throughput_results")
     source_times = plot_data["source_times"]
     begin_time = plot_data["begin_time"]
     if end_time is None:
         end_time = plot_data["end_time"]
-    # Filter the DataFrame for the specified time range
-    filtered_df = df[(df['time'] >= start_time) & (df['time'] <= end_time)].copy()
+    # Filter the records for the specified time range
+    filtered = records[(records['time'] >= start_time) & (records['time'] <= end_time)]
 
     # Calculate the REMA for the filtered data
-    filtered_df['throughput_ema'] = filtered_df['throughput'].ewm(alpha=0.1, adjust=False).mean()
+    throughput_ema = plotting_utilities.rema(filtered['throughput'])
 
     fig, (ax1, ax2) = plt.subplots(2, 1, height_ratios=[3, 1], figsize=(12, 8))
 
     # ------------------- Throughput Scatter Plot (Top Subplot) -------------------
     # Scatter plot for full num_flows
     ax1.scatter(
-        filtered_df['time'],
-        filtered_df['throughput'],
+        filtered['time'],
+        filtered['throughput'],
         color='blue',
         s=10,
         alpha=0.7,
     )
 
-    # REMA line for the filtered data
+    # REMA line for the filtered data (long tests are downsampled, the line looks the same)
+    rema_time, rema_throughput = plotting_utilities.downsample_lttb(filtered['time'], throughput_ema)
     ax1.plot(
-        filtered_df['time'],
-        filtered_df['throughput_ema'],
+        rema_time,
+        rema_throughput,
         color='red',
         linestyle='--',
         linewidth=1.5,
@@ -166,44 +148,8 @@ def plot_throughput_scatter_max_flows_only(plot_data, start_time=0, end_time=Non
     ax1.legend()
 
     # ------------------- Sockets Gantt Chart (Bottom Subplot) -------------------
-    # Create color map for unique socket IDs
-    unique_sockets = set(info['socket'] for info in source_times.values() if info['socket'] is not None)
-    colors = plt.cm.rainbow(np.linspace(0, 1, len(unique_sockets)))
-    socket_colors = dict(zip(unique_sockets, colors))
-
-    # Track which socket IDs we've already added to the legend
-    legend_added = set()
-
-    # Plot flow durations on the Gantt chart
-    y_offset = 0
-    for stream_id, info in source_times.items():
-        start_sec = (info['times'][0] - begin_time) / 1000
-        end_sec = (info['times'][1] - begin_time) / 1000
-
-        # Choose color based on socket ID
-        if info['socket'] is not None:
-            color = socket_colors[info['socket']]
-            label = f'Socket {info["socket"]}'
-
-            # Only add to legend if we haven't seen this socket ID before
-            if info['socket'] not in legend_added:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                           color=color, linewidth=2, label=label)
-                legend_added.add(info['socket'])
-            else:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                           color=color, linewidth=2)
-        else:
-            color = 'gray'
-            if 'no_socket' not in legend_added:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                           color=color, linewidth=2, label='No Socket')
-                legend_added.add('no_socket')
-            else:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                           color=color, linewidth=2)
-
-        y_offset += 1
+    socket_handles, socket_labels = plotting_utilities.plot_stream_gantt(ax2, source_times, begin_time, socket_colors=plotting_utilities.get_socket_colors(plot_data, plt.cm.rainbow),
+        stream_times=plotting_utilities.get_stream_times_sec(plot_data))
 
     # Add labels, legend, and grid for the Gantt chart
     ax2.set_xlabel('Time (seconds)')
@@ -211,7 +157,7 @@ def plot_throughput_scatter_max_flows_only(plot_data, start_time=0, end_time=Non
     ax2.set_yticks(range(len(source_times)))
     ax2.set_yticklabels([f'Source {id}' for id in source_times.keys()], fontsize=8)
     ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
-    ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
     # Align the x-axes of both plots - important for seeing correlation between throughput and socket activity
     ax1.set_xlim(ax2.get_xlim())
@@ -227,7 +173,6 @@ Has the option to add a scatter plot overlay. These points are also classified b
 """
 def plot_throughput_rema_separated_by_flows(plot_data, start_time=0, end_time=None, title=None, scatter=False):
     # Extract parameters from plot_data
-    throughput_list_dict = plot_data["throughput_by_flows"]
     source_times = plot_data["source_times"]
     begin_time = plot_data["begin_time"]
     save = plot_data["save"]
@@ -236,69 +181,23 @@ def plot_throughput_rema_separated_by_flows(plot_data, start_time=0, end_time=No
         end_time = plot_data["end_time"]
 
     fig, (ax1, ax2) = plt.subplots(2, 1, height_ratios=[3, 1], figsize=(10, 8))
-    flow_colors = {
-        1: "#9ecae1",
-        2: "#6baed6",
-        3: '#4292c6',
-        4: "#2171b5",
-        5: '#08519c',
-        6: "#08306b"
-    }
+    flow_colors = _FLOW_COLORS_BLUES
 
     # Another way of coloring the flows
     # unique_flows = sorted(throughput_list_dict.keys())
     # colors = plt.cm.tab10(np.linspace(0, 0.6, len(unique_flows)))
     # flow_colors = dict(zip(unique_flows, colors))
 
-    # Create a combined DataFrame with a 'flow_count' column
-    combined_data = []
-    for flow_count, throughput_list in throughput_list_dict.items():
-        for entry in throughput_list:
-            if start_time <= entry['time'] <= end_time:
-                combined_data.append({
-                    'time': entry['time'],
-                    'throughput': entry['throughput'],
-                    'flow_count': flow_count
-                })
-
-    combined_df = pd.DataFrame(combined_data).sort_values(by='time').reset_index(drop=True)
-
-    combined_df['throughput_ema'] = combined_df['throughput'].ewm(alpha=0.1, adjust=False).mean()
+    # Combined DataFrame with a 'flow_count' column and its REMA, built once per time window
+    combined_df = plotting_utilities.get_combined_throughput(plot_data, ("throughput_by_flows",), start_time, end_time, 'flow_count')
 
     # -------------------  Throughput Plot with color-coded segments (Top Subplot) -------------------
     if scatter:
-        for flow_count in sorted(throughput_list_dict.keys()):
-            mask = combined_df['flow_count'] == flow_count
-            if mask.any():  # Only plot if there are points with this flow count
-                ax1.scatter(
-                    combined_df.loc[mask, 'time'],
-                    combined_df.loc[mask, 'throughput'],
-                    color=flow_colors.get(flow_count, 'gray'),
-                    s=5,  # Slightly smaller points to avoid overwhelming the plot
-                    alpha=0.8,  # Slightly transparent
-                    label=f'{flow_count} Flows (data points)'
-                )
+        plotting_utilities.scatter_by_count(ax1, combined_df, 'flow_count', flow_colors)
 
     # Plot the REMA line as line segments with different colors
-    for i in range(1, len(combined_df)):
-        flow_count_prev = combined_df.iloc[i-1]['flow_count']
-        flow_count_current = combined_df.iloc[i]['flow_count']
-
-        if flow_count_prev != flow_count_current or i == len(combined_df) - 1:
-            # Find all consecutive points with the same flow count
-            segment_start = i-1
-            while segment_start > 0 and combined_df.iloc[segment_start-1]['flow_count'] == flow_count_prev:
-                segment_start -= 1
-
-            segment = combined_df.iloc[segment_start:i]
-
-            ax1.plot(
-                segment['time'],
-                segment['throughput_ema'],
-                color=flow_colors.get(flow_count_prev, 'gray'),
-                linewidth=1.5,
-                linestyle='--',
-            )
+    plotting_utilities.plot_count_segments(ax1, combined_df, 'flow_count', 'throughput_ema', flow_colors,
+                                           linewidth=1.5, linestyle='--')
 
     # Add labels, title, and legend
     ax1.set_xlabel('Time (seconds)')
@@ -322,47 +221,15 @@ def plot_throughput_rema_separated_by_flows(plot_data, start_time=0, end_time=No
     ax1.legend(handles=handles, labels=labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
     # -------------------  Sockets Gantt Chart (Bottom Subplot) -------------------
-    # Create color map for unique socket IDs
-    unique_sockets = set(info['socket'] for info in source_times.values() if info['socket'] is not None)
-    colors = plt.cm.Paired(np.linspace(0, 1, len(unique_sockets)))
-    socket_colors = dict(zip(unique_sockets, colors))
-
-    legend_added = set()
-
-    y_offset = 0
-    for stream_id, info in source_times.items():
-        start_sec = (info['times'][0] - begin_time) / 1000
-        end_sec = (info['times'][1] - begin_time) / 1000
-
-        if info['socket'] is not None:
-            color = socket_colors[info['socket']]
-            label = f'Socket {info["socket"]}'
-
-            if info['socket'] not in legend_added:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                          color=color, linewidth=2, label=label)
-                legend_added.add(info['socket'])
-            else:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                          color=color, linewidth=2)
-        else:
-            color = 'gray'
-            if 'no_socket' not in legend_added:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                          color=color, linewidth=2, label='No Socket')
-                legend_added.add('no_socket')
-            else:
-                ax2.hlines(y=y_offset, xmin=start_sec, xmax=end_sec,
-                          color=color, linewidth=2)
-
-        y_offset += 1
+    socket_handles, socket_labels = plotting_utilities.plot_stream_gantt(ax2, source_times, begin_time, socket_colors=plotting_utilities.get_socket_colors(plot_data, plt.cm.Paired),
+        stream_times=plotting_utilities.get_stream_times_sec(plot_data))
 
     ax2.set_xlabel('Time (seconds)')
     ax2.set_ylabel('HTTP Stream ID')
     ax2.set_yticks(range(len(source_times)))
     ax2.set_yticklabels([f'Stream {id}' for id in source_times.keys()], fontsize=8)
     ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
-    ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax2.legend(handles=socket_handles, labels=socket_labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
     ax1.set_xlim(start_time, end_time)
     ax2.set_xlim(start_time, end_time)
@@ -380,7 +247,6 @@ Each socket gets one row, and all streams using that socket are shown on that ro
 """
 def plot_throughput_rema_separated_by_flows_socket_grouped(plot_data, start_time=0, end_time=None, title=None, scatter=False, rema = False):
     # Extract parameters from plot_data
-    throughput_list_dict = plot_data["all_throughput_data"]['strict_throughput_by_flows']
     source_times = plot_data["source_times"]
     begin_time = plot_data["begin_time"]
     save = plot_data["save"]
@@ -400,65 +266,21 @@ def plot_throughput_rema_separated_by_flows_socket_grouped(plot_data, start_time
     # unique_flows = sorted(throughput_list_dict.keys())
     # colors = plt.cm.Paired(np.linspace(0, 0.6, len(unique_flows)))
     # flow_colors = dict(zip(unique_flows, colors))
-    flow_colors = {
-        1: 'Blue',
-        2: 'DeepSkyBlue',
-        3: 'Green',
-        4: 'Gold',
-        5: 'DarkOrange',
-        6: 'Red'
-    }
-
-
-    # Create a combined DataFrame with a 'flow_count' column
-    combined_data = []
-    for flow_count, throughput_list in throughput_list_dict.items():
-        for entry in throughput_list:
-            if start_time <= entry['time'] <= end_time:
-                combined_data.append({
-                    'time': entry['time'],
-                    'throughput': entry['throughput'],
-                    'flow_count': flow_count
-                })
-
-    combined_df = pd.DataFrame(combined_data).sort_values(by='time').reset_index(drop=True)
-
-    combined_df['throughput_ema'] = combined_df['throughput'].ewm(alpha=0.1, adjust=False).mean()
+    flow_colors = _FLOW_COLORS
+
+
+    # Combined DataFrame with a 'flow_count' column and its REMA, built once per time window
+    combined_df = plotting_utilities.get_combined_throughput(plot_data, ("all_throughput_data", "strict_throughput_by_flows"),
+                                                             start_time, end_time, 'flow_count')
 
     # -------------------  Throughput Plot with color-coded segments (Top Subplot) -------------------
     if scatter:
-        for flow_count in sorted(throughput_list_dict.keys()):
-            mask = combined_df['flow_count'] == flow_count
-            if mask.any():  # Only plot if there are points with this flow count
-                ax1.scatter(
-                    combined_df.loc[mask, 'time'],
-                    combined_df.loc[mask, 'throughput'],
-                    color=flow_colors.get(flow_count, 'gray'),
-                    s=5,  # Slightly smaller points to avoid overwhelming the plot
-                    alpha=0.8,  # Slightly transparent
-                    label=f'{flow_count} Flows (data points)'
-                )
+        plotting_utilities.scatter_by_count(ax1, combined_df, 'flow_count', flow_colors)
 
     # Plot the REMA line as line segments with different colors
-    for i in range(1, len(combined_df)):
-        flow_count_prev = combined_df.iloc[i-1]['flow_count']
-        flow_count_current = combined_df.iloc[i]['flow_count']
-
-        if flow_count_prev != flow_count_current or i == len(combined_df) - 1:
-            # Find all consecutive points with the same flow count
-            segment_start = i-1
-            while segment_start > 0 and combined_df.iloc[segment_start-1]['flow_count'] == flow_count_prev:
-                segment_start -= 1
-
-            segment = combined_df.iloc[segment_start:i]
-
-            # ax1.plot(
-            #     segment['time'],
-            #     segment['throughput_ema'],
-            #     color=flow_colors.get(flow_count_prev, 'gray'),
-            #     linewidth=1.5,
-            #     linestyle='--',
-            # )
+    if rema:
+        plotting_utilities.plot_count_segments(ax1, combined_df, 'flow_count', 'throughput_ema', flow_colors,
+                                               linewidth=1.5, linestyle='--')
 
     # Add labels, title, and legend
     ax1.set_xlabel('Time (seconds)')
@@ -486,53 +308,13 @@ def plot_throughput_rema_separated_by_flows_socket_grouped(plot_data, start_time
     ax1.legend(handles=handles, labels=labels, bbox_to_anchor=(1.05, 1), loc='upper left')
 
     # -------------------  Sockets Gantt Chart (Bottom Subplot) - Grouped by Socket -------------------
-    # Group streams by socket ID
-    socket_groups = {}
-    for stream_id, info in source_times.items():
-        socket_id = info['socket'] if info['socket'] is not None else 'no_socket'
-        if socket_id not in socket_groups:
-            socket_groups[socket_id] = []
-        socket_groups[socket_id].append({
-            'stream_id': stream_id,
-            'start': (info['times'][0] - begin_time) / 1000,
-            'end': (info['times'][1] - begin_time) / 1000
-        })
-
-    # Create color map for unique socket IDs
-    unique_sockets = [s for s in socket_groups.keys() if s != 'no_socket']
-    colors = plt.cm.Paired(np.linspace(0, 1, len(unique_sockets)))
-    socket_colors = dict(zip(unique_sockets, colors))
-    socket_colors['no_socket'] = 'gray'
-
-    # Plot each socket group on its own row
-    y_offset = 0
-    sorted_sockets = sorted([s for s in socket_groups.keys() if s != 'no_socket']) + (['no_socket'] if 'no_socket' in socket_groups else [])
-
-    for socket_id in sorted_sockets:
-        streams = socket_groups[socket_id]
-        color = socket_colors[socket_id]
-
-        # Plot all streams for this socket on the same row
-        for stream in streams:
-            ax2.hlines(y=y_offset, xmin=stream['start'], xmax=stream['end'],
-                      color=color, linewidth=2)
-
-        y_offset += 1
+    plotting_utilities.plot_socket_gantt(ax2, source_times, begin_time, socket_colors=plotting_utilities.get_socket_colors(plot_data, plt.cm.Paired),
+        stream_times=plotting_utilities.get_stream_times_sec(plot_data))
 
     ax2.set_xlabel('Time (seconds)')
     ax2.set_ylabel('Socket ID')
-    ax2.set_yticks(range(len(sorted_sockets)))
-    ax2.set_yticklabels([f'Socket {s}' if s != 'no_socket' else 'No Socket' for s in sorted_sockets], fontsize=8)
     ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
 
-    # Create legend for sockets
-    socket_handles = []
-    socket_labels = []
-    for socket_id in sorted_sockets:
-        color = socket_colors[socket_id]
-        socket_handles.append(plt.Line2D([0], [0], color=color, lw=2))
-        socket_labels.append(f'Socket {socket_id}' if socket_id != 'no_socket' else 'No Socket')
-
     ax1.set_xlim(start_time, end_time)
     ax2.set_xlim(start_time, end_time)
 
@@ -570,17 +352,8 @@ def plot_throughput_max_flow_only(plot_data, start_time=0, end_time=None, title=
     line_color = 'Red'
 
     # Create a DataFrame with only the maximum flow count data
-    combined_data = []
-    if max_flow_count in throughput_list_dict:
-        for entry in throughput_list_dict[max_flow_count]:
-            if start_time <= entry['time'] <= end_time:
-                combined_data.append({
-                    'time': entry['time'],
-                    'throughput': entry['throughput'],
-                    'flow_count': max_flow_count
-                })
-
-    combined_df = pd.DataFrame(combined_data).sort_values(by='time').reset_index(drop=True)
+    combined_df = plotting_utilities.combine_throughput_by_count(
+        {max_flow_count: throughput_list_dict[max_flow_count]}, start_time, end_time, 'flow_count')
 
     if len(combined_df) > 0:
         # -------------------  Throughput Plot (Top Subplot) -------------------
@@ -627,53 +400,13 @@ def plot_throughput_max_flow_only(plot_data, start_time=0, end_time=None, title=
         ax1.set_ylabel('Throughput (Mbps)')
 
     # -------------------  Sockets Gantt Chart (Bottom Subplot) - Grouped by Socket -------------------
-    # Group streams by socket ID
-    socket_groups = {}
-    for stream_id, info in source_times.items():
-        socket_id = info['socket'] if info['socket'] is not None else 'no_socket'
-        if socket_id not in socket_groups:
-            socket_groups[socket_id] = []
-        socket_groups[socket_id].append({
-            'stream_id': stream_id,
-            'start': (info['times'][0] - begin_time) / 1000,
-            'end': (info['times'][1] - begin_time) / 1000
-        })
-
-    # Create color map for unique socket IDs
-    unique_sockets = [s for s in socket_groups.keys() if s != 'no_socket']
-    colors = plt.cm.Paired(np.linspace(0, 1, len(unique_sockets)))
-    socket_colors = dict(zip(unique_sockets, colors))
-    socket_colors['no_socket'] = 'gray'
-
-    # Plot each socket group on its own row
-    y_offset = 0
-    sorted_sockets = sorted([s for s in socket_groups.keys() if s != 'no_socket']) + (['no_socket'] if 'no_socket' in socket_groups else [])
-
-    for socket_id in sorted_sockets:
-        streams = socket_groups[socket_id]
-        color = socket_colors[socket_id]
-
-        # Plot all streams for this socket on the same row
-        for stream in streams:
-            ax2.hlines(y=y_offset, xmin=stream['start'], xmax=stream['end'],
-                      color=color, linewidth=2)
-
-        y_offset += 1
+    plotting_utilities.plot_socket_gantt(ax2, source_times, begin_time, socket_colors=plotting_utilities.get_socket_colors(plot_data, plt.cm.Paired),
+        stream_times=plotting_utilities.get_stream_times_sec(plot_data))
 
     ax2.set_xlabel('Time (seconds)')
     ax2.set_ylabel('Socket ID')
-    ax2.set_yticks(range(len(sorted_sockets)))
-    ax2.set_yticklabels([f'Socket {s}' if s != 'no_socket' else 'No Socket' for s in sorted_sockets], fontsize=8)
     ax2.grid(True, axis='y', linestyle='--', alpha=0.3)
 
-    # Create legend for sockets
-    socket_handles = []
-    socket_labels = []
-    for socket_id in sorted_sockets:
-        color = socket_colors[socket_id]
-        socket_handles.append(plt.Line2D([0], [0], color=color, lw=2))
-        socket_labels.append(f'Socket {socket_id}' if socket_id != 'no_socket' else 'No Socket')
-
     ax1.set_xlim(start_time, end_time)
     ax2.set_xlim(start_time, end_time)
 
@@ -2,8 +2,37 @@
 The following functions are defined:
 1) ensure_plot_dir: Ensures that the plot directory exists - used when we need to save the plots to their corresponding tests
 2) save_figure: Saves the figure to the plot_images directory if it doesn't already exist
+3) plot_count_segments: Plots a line as runs of consecutive points sharing the same flow/socket count, colored by that count (one LineCollection)
+4) rema: Recursive exponential moving average of a series (same result as pandas ewm(alpha, adjust=False).mean())
+5) plot_stream_gantt: Draws the HTTP stream Gantt chart (one row per stream, colored by socket) as a single LineCollection
+6) combine_throughput_by_count: Flattens {count: [throughput points]} into one time-sorted DataFrame with a count column
+7) plot_socket_gantt: Draws the HTTP stream Gantt chart grouped by socket (one row per socket) as a single LineCollection
+8) downsample_lttb: Reduces a long line series to a fixed number of points while keeping its visual shape (Largest-Triangle-Three-Buckets)
+9) socket_color_map / get_socket_colors: Maps socket IDs (sorted) to colormap colors, memoized per socket set and cached on plot_data
+10) get_throughput_records: Converts a list of throughput dicts into a (time, throughput) structured array, cached on plot_data
+11) rema_many: REMA of several series at once, run as one filter pass over a zero-padded 2-D array
+12) count_colors_rgba: Looks up the color of every flow/socket count at once through an RGBA index table
+13) colormap_colors: n evenly spaced colors from a named colormap, cached so each (colormap, n) table is only built once
+14) stream_times_sec / get_stream_times_sec: HTTP stream start/end times as seconds from begin_time in one array, cached on plot_data
+15) scatter_by_count: Scatters the points colored by their flow/socket count in a single scatter call (ListedColormap + BoundaryNorm)
+16) get_combined_throughput: combine_throughput_by_count plus its REMA column, cached on plot_data per time window
+17) prepare_plot_data: Converts a test's stream times and throughput lists to arrays once, before any plot is drawn
 """
 import os
+from functools import lru_cache
+import numpy as np
+import matplotlib
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import BoundaryNorm, ListedColormap, to_rgba_array
+from scipy.signal import lfilter
+
+# Line series longer than this are downsampled before plotting - a 10-14 inch figure can't show more detail than this
+MAX_LINE_POINTS = 4000
+
+# Column layout of the cached throughput arrays (see get_throughput_records)
+THROUGHPUT_DTYPE = np.dtype([('time', 'f8'), ('throughput', 'f8')])
 
 
 def ensure_plot_dir(base_path):
@@ -29,3 +58,519 @@ def save_figure(fig, base_path, filename):
     print(f"Saved plot to: {filepath}")
     return True
 
+
+def plot_count_segments(ax, df, count_column, value_column, count_colors, **line_kwargs):
+    """
+    Plot a line as segments of consecutive points that share the same count (flows or sockets),
+    with each segment colored by its count.
+
+    Args:
+        ax: Axes to draw on
+        df (DataFrame): Time-sorted data with a 'time' column, value_column and count_column
+        count_column (str): Column holding the flow/socket count of each point
+        value_column (str): Column holding the y-values to plot (ex: the REMA)
+        count_colors (dict): {count: color}, counts without an entry are drawn in gray
+        **line_kwargs: Passed on to the LineCollection (linewidth, linestyle, ...)
+    """
+    times = df['time'].to_numpy()
+    values = df[value_column].to_numpy()
+    counts = df[count_column].to_numpy()
+
+    # Run-length encode the counts: a new segment starts wherever the count changes from the previous point
+    change = np.flatnonzero(np.diff(counts) != 0) + 1
+    starts = np.r_[0, change]
+    ends = np.r_[change, len(counts)]
+    segment_colors = count_colors_rgba(counts[starts[starts < len(counts)]], count_colors)
+
+    # All segments go into one LineCollection instead of one Line2D per segment
+    segments = [np.column_stack([times[start:end], values[start:end]]) for start, end in zip(starts, ends) if end > start]
+    ax.add_collection(LineCollection(segments, colors=segment_colors, **line_kwargs))
+    ax.autoscale_view()
+
+
+def rema(values, alpha=0.1):
+    """
+    Compute the recursive exponential moving average (REMA) y[n] = alpha * x[n] + (1 - alpha) * y[n-1].
+    Matches pandas ewm(alpha=alpha, adjust=False).mean(), but runs the recursion as a single IIR filter pass.
+
+    Args:
+        values (array-like): Series to smooth, in time order
+        alpha (float): Smoothing factor
+
+    Returns:
+        ndarray: The smoothed series
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+
+    # Seed the filter state so the first output equals the first input (pandas' adjust=False behaviour)
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], values, zi=[(1 - alpha) * values[0]])
+    return smoothed
+
+
+def rema_many(series_list, alpha=0.1):
+    """
+    Compute the REMA of several series (e.g. one per HTTP stream) with a single filter call.
+    The series are stacked into a zero-padded 2-D array and filtered along each row. The recursion is causal,
+    so the padding after a series never changes its values.
+
+    Args:
+        series_list (list): Series to smooth, each in time order (lengths may differ)
+        alpha (float): Smoothing factor
+
+    Returns:
+        list: The smoothed series as ndarrays, in the same order and with the same lengths as series_list
+    """
+    if not series_list:
+        return []
+
+    lengths = np.fromiter((len(series) for series in series_list), dtype=int, count=len(series_list))
+    if lengths.max() == 0:
+        return [np.empty(0) for _ in series_list]
+
+    padded = np.zeros((len(series_list), lengths.max()))
+    padded[np.arange(lengths.max()) < lengths[:, None]] = np.concatenate(series_list)
+
+    # Seed each row's filter state so its first output equals its first input
+    smoothed, _ = lfilter([alpha], [1, alpha - 1], padded, axis=1, zi=(1 - alpha) * padded[:, :1])
+    return [row[:length] for row, length in zip(smoothed, lengths)]
+
+
+def plot_stream_gantt(ax, source_times, begin_time, colormap=plt.cm.rainbow, linewidth=2, socket_colors=None, stream_times=None):
+    """
+    Draw the HTTP stream Gantt chart, one row per stream, colored by the socket the stream used.
+    All rows are drawn as a single LineCollection rather than one hlines call per stream.
+
+    Args:
+        ax: Axes to draw on
+        source_times (dict): {stream_id: {'times': [start, end], 'socket': socket_id}}
+        begin_time (int): Start time in milliseconds, used to normalize the stream times to seconds
+        colormap: Matplotlib colormap used to color the sockets (streams without a socket are gray)
+        linewidth (float): Width of each stream's line
+        socket_colors (dict): Optional precomputed {socket_id: color} (see get_socket_colors), overrides colormap
+        stream_times (ndarray): Optional precomputed (start, end) seconds per stream (see get_stream_times_sec)
+
+    Returns:
+        tuple: (handles, labels) with one legend entry per socket, in the order the sockets first appear
+    """
+    if not source_times:
+        return [], []
+    if stream_times is None:
+        stream_times = stream_times_sec(source_times, begin_time)
+
+    # One (start, row) -> (end, row) segment per stream
+    rows = np.arange(len(stream_times))
+    segments = np.stack([np.column_stack([stream_times[:, 0], rows]),
+                         np.column_stack([stream_times[:, 1], rows])], axis=1)
+
+    # Socket of each stream (-1 for streams without a socket)
+    stream_sockets = _stream_sockets(source_times)
+    if (stream_sockets == -1).all():
+        # No stream has a socket: draw everything gray without building a palette or looking up colors
+        ax.add_collection(LineCollection(segments, colors='gray', linewidths=linewidth))
+        _set_gantt_limits(ax, segments, len(source_times))
+        return [plt.Line2D([0], [0], color='gray', lw=linewidth)], ['No Socket']
+
+    # The color of each stream's segment
+    if socket_colors is None:
+        socket_colors = socket_color_map(source_times, colormap)
+    segment_colors = [socket_colors.get(socket_id, 'gray') if socket_id != -1 else 'gray' for socket_id in stream_sockets.tolist()]
+
+    # One legend entry per socket, at the first stream that used it (np.unique gives each socket's first index)
+    _, first_idx = np.unique(stream_sockets, return_index=True)
+    handles = []
+    labels = []
+    for i in np.sort(first_idx):
+        socket_id = stream_sockets[i]
+        handles.append(plt.Line2D([0], [0], color=segment_colors[i], lw=linewidth))
+        labels.append(f'Socket {socket_id}' if socket_id != -1 else 'No Socket')
+
+    ax.add_collection(LineCollection(segments, colors=segment_colors, linewidths=linewidth))
+    _set_gantt_limits(ax, segments, len(source_times))
+
+    return handles, labels
+
+
+def combine_throughput_by_count(throughput_list_dict, start_time, end_time, count_column='flow_count'):
+    """
+    Flatten throughput results keyed by flow (or socket) count into one time-sorted DataFrame.
+
+    Args:
+        throughput_list_dict (dict): {count: [{'time': sec, 'throughput': Mbps}, ...]}
+        start_time (float): Start of the time window to keep (seconds)
+        end_time (float): End of the time window to keep (seconds)
+        count_column (str): Name of the column holding each point's count
+
+    Returns:
+        DataFrame: Columns 'time', 'throughput' and count_column, sorted by time
+    """
+    num_points = sum(len(throughput_list) for throughput_list in throughput_list_dict.values())
+    times = np.fromiter((entry['time'] for throughput_list in throughput_list_dict.values() for entry in throughput_list),
+                        dtype=float, count=num_points)
+    throughputs = np.fromiter((entry['throughput'] for throughput_list in throughput_list_dict.values() for entry in throughput_list),
+                              dtype=float, count=num_points)
+    counts = np.repeat(np.fromiter(throughput_list_dict.keys(), dtype=int, count=len(throughput_list_dict)),
+                       [len(throughput_list) for throughput_list in throughput_list_dict.values()])
+
+    # Filter to the time window, then sort by time on the arrays (stable, so equal times keep their count order)
+    in_window = np.flatnonzero((times >= start_time) & (times <= end_time))
+    order = in_window[np.argsort(times[in_window], kind='stable')]
+
+    return pd.DataFrame({'time': times[order], 'throughput': throughputs[order], count_column: counts[order]})
+
+
+def get_combined_throughput(plot_data, keys, start_time, end_time, count_column='flow_count'):
+    """
+    Get the combined, time-sorted throughput DataFrame (with its 'throughput_ema' REMA column) for a test,
+    building it only once per time window and caching it on plot_data so re-plots skip the conversion.
+
+    Args:
+        plot_data (dict): The plot data for a test
+        keys (tuple): Path to the {count: [throughput points]} dict inside plot_data, e.g. ('throughput_by_flows',)
+        start_time (float): Start of the time window to keep (seconds)
+        end_time (float): End of the time window to keep (seconds)
+        count_column (str): Name of the column holding each point's count
+
+    Returns:
+        DataFrame: Columns 'time', 'throughput', count_column and 'throughput_ema', sorted by time (shared, don't modify)
+    """
+    cached_frames = plot_data.setdefault('combined_throughput', {})
+    cache_key = (keys, start_time, end_time, count_column)
+    if cache_key not in cached_frames:
+        throughput_list_dict = plot_data
+        for key in keys:
+            throughput_list_dict = throughput_list_dict[key]
+        combined_df = combine_throughput_by_count(throughput_list_dict, start_time, end_time, count_column)
+        combined_df['throughput_ema'] = rema(combined_df['throughput'])
+        cached_frames[cache_key] = combined_df
+    return cached_frames[cache_key]
+
+
+def _stream_sockets(source_times):
+    # Socket ID of each stream in source_times order, -1 for streams without a socket
+    return np.fromiter((info['socket'] if info['socket'] is not None else -1 for info in source_times.values()),
+                       dtype=np.int64, count=len(source_times))
+
+
+def _set_gantt_limits(ax, segments, num_rows):
+    """
+    Set a Gantt chart's limits directly from its segment end points instead of autoscaling over the axes' artists.
+    Keeps the axes' default margins, so the chart looks the same as an autoscaled one.
+
+    Args:
+        ax: Axes the Gantt chart was drawn on
+        segments (ndarray): (num_segments, 2, 2) array of [(start_sec, row), (end_sec, row)]
+        num_rows (int): Number of rows in the chart
+    """
+    if len(segments) == 0:
+        return
+
+    segment_times = segments[:, :, 0]
+    x_min, x_max = segment_times.min(), segment_times.max()
+    x_margin, y_margin = ax.margins()
+
+    if x_max > x_min:
+        x_pad = (x_max - x_min) * x_margin
+        ax.set_xlim(x_min - x_pad, x_max + x_pad)
+
+    # A single row has no height to take a margin from, so give it half a row above and below
+    y_pad = (num_rows - 1) * y_margin if num_rows > 1 else 0.5
+    ax.set_ylim(-y_pad, num_rows - 1 + y_pad)
+
+
+def plot_socket_gantt(ax, source_times, begin_time, colormap=plt.cm.Paired, linewidth=2, socket_colors=None, stream_times=None):
+    """
+    Draw the HTTP stream Gantt chart grouped by socket: each socket gets one row, and all streams
+    that used that socket are drawn on it. Streams without a socket share a final 'No Socket' row.
+
+    Args:
+        ax: Axes to draw on
+        source_times (dict): {stream_id: {'times': [start, end], 'socket': socket_id}}
+        begin_time (int): Start time in milliseconds, used to normalize the stream times to seconds
+        colormap: Matplotlib colormap used to color the sockets (streams without a socket are gray)
+        linewidth (float): Width of each stream's line
+        socket_colors (dict): Optional precomputed {socket_id: color} (see get_socket_colors), overrides colormap
+        stream_times (ndarray): Optional precomputed (start, end) seconds per stream (see get_stream_times_sec)
+
+    Returns:
+        tuple: (handles, labels) with one legend entry per socket row
+    """
+    if not source_times:
+        return [], []
+    if stream_times is None:
+        stream_times = stream_times_sec(source_times, begin_time)
+
+    # The palette is only needed when at least one stream has a socket (streams without one are gray)
+    stream_sockets = _stream_sockets(source_times)
+    if socket_colors is None and (stream_sockets != -1).any():
+        socket_colors = socket_color_map(source_times, colormap)
+
+    # Group the streams by socket: np.unique gives the sorted socket IDs (one row each) and every stream's row
+    row_sockets, stream_rows = np.unique(stream_sockets, return_inverse=True)
+    if len(row_sockets) > 0 and row_sockets[0] == -1:
+        # Streams without a socket sort first as -1, but their 'No Socket' row goes last
+        row_sockets = np.r_[row_sockets[1:], -1]
+        stream_rows = (stream_rows - 1) % len(row_sockets)
+
+    handles = []
+    labels = []
+    row_colors = []
+    for socket_id in row_sockets.tolist():
+        color = socket_colors.get(socket_id, 'gray') if socket_id != -1 else 'gray'
+        row_colors.append(color)
+        handles.append(plt.Line2D([0], [0], color=color, lw=linewidth))
+        labels.append(f'Socket {socket_id}' if socket_id != -1 else 'No Socket')
+
+    # One (start, row) -> (end, row) segment per stream, on its socket's row
+    segments = np.stack([np.column_stack([stream_times[:, 0], stream_rows]),
+                         np.column_stack([stream_times[:, 1], stream_rows])], axis=1)
+    segment_colors = to_rgba_array(row_colors)[stream_rows]
+    ax.add_collection(LineCollection(segments, colors=segment_colors, linewidths=linewidth))
+    _set_gantt_limits(ax, segments, len(row_sockets))
+
+    ax.set_yticks(range(len(row_sockets)))
+    ax.set_yticklabels(labels, fontsize=8)
+
+    return handles, labels
+
+
+def downsample_lttb(x, y, num_points=MAX_LINE_POINTS):
+    """
+    Downsample a line series with Largest-Triangle-Three-Buckets (LTTB). The first and last points are always kept,
+    and from each bucket in between, the point forming the largest triangle with its neighbors is kept,
+    so peaks and dips survive the reduction.
+
+    Args:
+        x (array-like): Sorted x-values (ex: time in seconds)
+        y (array-like): y-values (ex: REMA throughput)
+        num_points (int): Number of points to keep
+
+    Returns:
+        tuple: (x, y) ndarrays, unchanged if the series already has num_points or fewer
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= num_points or num_points < 3:
+        return x, y
+
+    # Split the interior points into num_points - 2 buckets
+    edges = np.linspace(1, n - 1, num_points - 1).astype(int)
+    keep = np.empty(num_points, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    prev = 0
+    for i in range(num_points - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (the last bucket looks ahead to the final point)
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Triangle area (x2) between the previously kept point, each candidate and the next bucket's average
+        areas = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev]) - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(areas))
+        keep[i + 1] = prev
+
+    return x[keep], y[keep]
+
+
+def socket_color_map(source_times, colormap=plt.cm.Paired):
+    """
+    Map each socket ID to a color sampled evenly from the colormap, in sorted socket ID order.
+    Sorting makes the colors deterministic: the same set of sockets always gets the same colors.
+
+    Args:
+        source_times (dict): {stream_id: {'times': [start, end], 'socket': socket_id}}
+        colormap: Matplotlib colormap to sample
+
+    Returns:
+        dict: {socket_id: RGBA color}, streams without a socket are not included (they are drawn gray)
+    """
+    stream_sockets = _stream_sockets(source_times)
+    unique_sockets = frozenset(stream_sockets[stream_sockets >= 0].tolist())
+    return dict(_socket_palette(colormap.name, unique_sockets))
+
+
+@lru_cache(maxsize=128)
+def _socket_palette(colormap_name, unique_sockets):
+    # Memoized by (colormap, set of sockets), returned as pairs so callers can't modify the cached value
+    sorted_sockets = sorted(unique_sockets)
+    return tuple(zip(sorted_sockets, colormap_colors(colormap_name, len(sorted_sockets))))
+
+
+def get_socket_colors(plot_data, colormap=plt.cm.Paired):
+    """
+    Get the socket color map for a test, computing it only once per colormap and caching it on plot_data.
+
+    Args:
+        plot_data (dict): The plot data for a test (must contain 'source_times')
+        colormap: Matplotlib colormap to sample
+
+    Returns:
+        dict: {socket_id: RGBA color}
+    """
+    cached_colors = plot_data.setdefault('socket_colors', {})
+    if colormap.name not in cached_colors:
+        cached_colors[colormap.name] = socket_color_map(plot_data['source_times'], colormap)
+    return cached_colors[colormap.name]
+
+
+def get_throughput_records(plot_data, *keys):
+    """
+    Get a throughput result list from plot_data as a structured NumPy array, converting it only once per test.
+
+    Args:
+        plot_data (dict): The plot data for a test
+        *keys: Path to the throughput list inside plot_data, e.g. ('throughput_results',) or
+            ('filtered_throughput_data', 'strict_interval_throughput_results')
+
+    Returns:
+        np.ndarray: Structured array with 'time' and 'throughput' fields (rec['time'], rec['throughput'])
+    """
+    cached_records = plot_data.setdefault('throughput_np', {})
+    if keys not in cached_records:
+        throughput_results = plot_data
+        for key in keys:
+            throughput_results = throughput_results[key]
+        cached_records[keys] = np.fromiter(
+            ((point['time'], point['throughput']) for point in throughput_results),
+            dtype=THROUGHPUT_DTYPE, count=len(throughput_results))
+    return cached_records[keys]
+
+
+def count_colors_rgba(counts, count_colors, default='gray'):
+    """
+    Look up the color of each flow/socket count with one array index instead of a dict lookup per point.
+    The count_colors dict is turned into an RGBA table indexed by count, whose last row holds the default color.
+
+    Args:
+        counts (array-like): Integer flow/socket counts
+        count_colors (dict): {count: color}
+        default: Color for counts without an entry in count_colors
+
+    Returns:
+        ndarray: (len(counts), 4) RGBA colors
+    """
+    counts = np.asarray(counts, dtype=int)
+    num_rows = max(count_colors, default=-1) + 1
+
+    color_table = np.tile(to_rgba_array(default), (num_rows + 1, 1))
+    for count, color in count_colors.items():
+        if count >= 0:
+            color_table[count] = to_rgba_array(color)[0]
+
+    # Counts outside the table (negative or above the largest key) use the default row
+    table_index = np.where((counts >= 0) & (counts < num_rows), counts, num_rows)
+    return color_table[table_index]
+
+
+@lru_cache(maxsize=64)
+def colormap_colors(colormap_name, num_colors):
+    """
+    Get num_colors evenly spaced colors from a colormap (same as colormap(np.linspace(0, 1, num_colors))).
+    Plots ask for the same few tables over and over, so each one is only computed once.
+
+    Args:
+        colormap_name (str): Name of a registered Matplotlib colormap (ex: 'rainbow', 'coolwarm')
+        num_colors (int): Number of colors
+
+    Returns:
+        ndarray: (num_colors, 4) RGBA colors, read-only since the table is shared between callers
+    """
+    colors = matplotlib.colormaps[colormap_name](np.linspace(0, 1, num_colors))
+    colors.flags.writeable = False
+    return colors
+
+
+def stream_times_sec(source_times, begin_time):
+    """
+    Convert every HTTP stream's start/end time from milliseconds to seconds from begin_time in one vectorized step.
+
+    Args:
+        source_times (dict): {stream_id: {'times': [start, end], 'socket': socket_id}}
+        begin_time (int): Start time in milliseconds
+
+    Returns:
+        ndarray: (num_streams, 2) array of (start_sec, end_sec), in source_times order
+    """
+    stream_times = np.fromiter((t for info in source_times.values() for t in info['times'][:2]),
+                               dtype=float, count=2 * len(source_times)).reshape(-1, 2)
+    return (stream_times - begin_time) / 1000
+
+
+def get_stream_times_sec(plot_data):
+    """
+    Get the stream start/end times in seconds for a test, converting them only once and caching them on plot_data.
+
+    Args:
+        plot_data (dict): The plot data for a test (must contain 'source_times' and 'begin_time')
+
+    Returns:
+        ndarray: (num_streams, 2) array of (start_sec, end_sec), in source_times order
+    """
+    if 'stream_times_sec' not in plot_data:
+        plot_data['stream_times_sec'] = stream_times_sec(plot_data['source_times'], plot_data['begin_time'])
+    return plot_data['stream_times_sec']
+
+
+# Throughput result lists that plots read through get_throughput_records
+THROUGHPUT_RECORD_KEYS = (
+    ('throughput_results',),
+    ('all_throughput_data', 'strict_interval_throughput_results'),
+    ('filtered_throughput_data', 'strict_interval_throughput_results'),
+)
+
+
+def prepare_plot_data(plot_data):
+    """
+    Convert a test's plot inputs to their array (column) form once, when the plot data is loaded, so the
+    individual plots read cached arrays instead of each walking the source dicts and lists at draw time.
+
+    Args:
+        plot_data (dict): The plot data for a test, the arrays are cached on it (see get_stream_times_sec, get_throughput_records)
+    """
+    if plot_data.get('source_times'):
+        get_stream_times_sec(plot_data)
+
+    for keys in THROUGHPUT_RECORD_KEYS:
+        throughput_results = plot_data
+        for key in keys:
+            throughput_results = throughput_results.get(key) if isinstance(throughput_results, dict) else None
+        if throughput_results is not None:
+            get_throughput_records(plot_data, *keys)
+
+
+def scatter_by_count(ax, df, count_column, count_colors, s=5, alpha=0.8, rasterized=True):
+    """
+    Scatter the throughput points colored by their flow/socket count with one scatter call (instead of one per count),
+    the color of each point coming from a colormap lookup rather than a separate call per count. Points are drawn in
+    increasing count order, so higher counts stay on top as with separate per-count calls. The points are small and
+    slightly transparent so the dense cloud does not overwhelm the plot, and rasterized so it is stored as an image
+    instead of one vector path per point.
+
+    Args:
+        ax: Axes to draw on
+        df (DataFrame): Data with 'time', 'throughput' and count_column columns
+        count_column (str): Column holding the flow/socket count of each point
+        count_colors (dict): {count: color}, counts without an entry are drawn in gray
+        s (float): Marker size
+        alpha (float): Marker transparency
+        rasterized (bool): Whether to rasterize the points
+    """
+    counts = df[count_column].to_numpy()
+    order = np.argsort(counts, kind='stable')
+
+    # Let matplotlib map the counts to colors: one colormap entry per count from 0 to the largest key,
+    # with a BoundaryNorm putting each integer count in its own bin (missing and out of range counts are gray)
+    num_colors = max(count_colors, default=0) + 1
+    count_cmap = ListedColormap([count_colors.get(count, 'gray') for count in range(num_colors)])
+    count_cmap = count_cmap.with_extremes(under='gray', over='gray')
+    count_norm = BoundaryNorm(np.arange(num_colors + 1) - 0.5, num_colors)
+
+    ax.scatter(df['time'].to_numpy()[order], df['throughput'].to_numpy()[order],
+               c=counts[order], cmap=count_cmap, norm=count_norm, s=s, alpha=alpha, rasterized=rasterized)
@@ -2,6 +2,7 @@
 This class is used for accumulating statistics throughout the pipeline execution. It provides a structured way to add, organize, and save statistics derived from the data analysis process.
 """
 import os
+import csv
 import json
 from typing import Any, Dict
 
@@ -144,14 +145,25 @@ class StatisticsAccumulator:
             config_stats.add('mean_throughput_mbps', 542.3)
             config_stats.append_to_csv()  # Writes one row to CSV
         """
-        import pandas as pd
-
         filepath = os.path.join(self.base_path, filename)
 
         # Flatten nested dicts if any exist
         flat_stats = self._flatten_dict(self.summary_stats)
 
-        # Create or append to CSV
+        # Fast path: the file already has exactly these columns, so just append one row
+        # instead of reading and rewriting the whole CSV
+        if os.path.exists(filepath):
+            with open(filepath, 'r', newline='') as f:
+                header = next(csv.reader(f), None)
+            if header == list(flat_stats.keys()):
+                with open(filepath, 'a', newline='') as f:
+                    csv.writer(f, lineterminator='\n').writerow(flat_stats.values())
+                print(f"Appended statistics to: {filepath}")
+                return filepath
+
+        import pandas as pd
+
+        # Create or append to CSV (pandas lines up differing columns)
         if os.path.exists(filepath):
             df = pd.read_csv(filepath)
             df = pd.concat([df, pd.DataFrame([flat_stats])], ignore_index=True)
@@ -7,6 +7,7 @@ This driver coordinates:
 3. Consolidating all statistics for output
 """
 import os
+import numpy as np
 from .statistics_accumulator import StatisticsAccumulator
 from . import summary_statistics as stats_funcs
 
@@ -19,7 +20,8 @@ def compute_all_statistics(
     throughput_results,
     begin_time,
     base_path,
-    test_type=None
+    test_type=None,
+    byte_count_arrays=None
 ):
     """
     Compute all statistics from pipeline outputs.
@@ -36,6 +38,7 @@ def compute_all_statistics(
         begin_time: Test start time
         base_path: Directory for saving outputs
         test_type: 'upload' or 'download'
+        byte_count_arrays: (times, sums, counts) arrays of byte_count, built here if not given
 
     Returns:
         StatisticsAccumulator with all computed statistics
@@ -53,7 +56,10 @@ def compute_all_statistics(
 
     # === Flow/Stream Statistics ===
     print("  [1/5] Computing flow and stream statistics...")
-    num_flows = max(byte_count[timestamp][1] for timestamp in byte_count)
+    if byte_count_arrays is None:
+        import data_normalization as data_norm  # Imported here, data_normalization imports this package
+        byte_count_arrays = data_norm.byte_count_arrays(byte_count)
+    num_flows = int(byte_count_arrays.counts.max())
     stats.add('num_flows', num_flows)
     stats.add('num_streams', len(byte_list))
 
@@ -90,14 +96,18 @@ def compute_all_statistics(
         if not results:
             continue
 
-        throughputs = [r['throughput'] for r in results]
+        # One array per bin size, reduced with NumPy (results is non-empty here, so no empty-list guards are needed)
+        throughputs = np.fromiter((r['throughput'] for r in results), dtype=float, count=len(results))
+        min_mbps = float(throughputs.min())
+        max_mbps = float(throughputs.max())
+        middle = len(throughputs) // 2
         throughput_stats[f'bin_{bin_size}ms'] = {
             'num_points': len(throughputs),
-            'mean_mbps': sum(throughputs) / len(throughputs) if throughputs else 0,
-            'median_mbps': sorted(throughputs)[len(throughputs)//2] if throughputs else 0,
-            'min_mbps': min(throughputs) if throughputs else 0,
-            'max_mbps': max(throughputs) if throughputs else 0,
-            'range_mbps': max(throughputs) - min(throughputs) if throughputs else 0
+            'mean_mbps': float(throughputs.mean()),
+            'median_mbps': float(np.partition(throughputs, middle)[middle]),  # Upper median, without a full sort
+            'min_mbps': min_mbps,
+            'max_mbps': max_mbps,
+            'range_mbps': max_mbps - min_mbps
         }
 
     stats.add_phase('throughput', throughput_stats)
@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import numpy as np
 """
 Counts the total bytes transferred by each http stream ID.
 Takes a list of stream data and returns a dictionary mapping stream IDs to their total byte counts.
@@ -17,8 +18,12 @@ def sum_byte_counts(byte_list):
             id_num = item['id']
             byte_sum = 0
 
+            # Normalized streams already hold their byte counts as an int64 array (stored by data_normalization.stream_arrays)
+            if 'bytecounts' in item:
+                byte_sum = int(item['bytecounts'].sum())
+
             # Check if this is byte_time_list format (has 'bytecount')
-            if 'progress' in item and any('bytecount' in p for p in item['progress'] if p):
+            elif 'progress' in item and any('bytecount' in p for p in item['progress'] if p):
               # Sum the bytecount values
                 for progress in item['progress']:
                     if 'bytecount' in progress:
@@ -47,10 +52,16 @@ that have the same number of flows contributing to the bytecount.
 For example, we can see that 'x' number of events have 1 flow conributing, 'y' events have 2 flows contributing, etc.
 """
 def find_test_duration(data):
-    first_timestamp = int(data[0]['progress'][0]['time'])
-    last_timestamp = int(data[-1]['progress'][-1]['time'])
+    import data_normalization as data_norm  # Imported here, data_normalization imports this package
+
+    # Earliest and latest event over every stream, so the duration does not depend on the order of the streams
+    # (the last stream in the list is not always the last one to finish) or of their progress entries. Each stream's
+    # times are the int64 array cached by stream_arrays, so only one min and one max per stream are computed
+    stream_times = [data_norm.stream_arrays(entry)[0] for entry in data if entry['progress']]
+    if not stream_times:
+        return 0
 
-    duration_ms = last_timestamp - first_timestamp
+    duration_ms = int(max(times.max() for times in stream_times) - min(times.min() for times in stream_times))
     #duration_seconds = duration_ms / 1000.0
 
     return duration_ms
@@ -181,26 +192,21 @@ def save_socket_stream_data(byte_list, source_times, outputDir, print_output = F
     http_stream_data_structure["socket_data"] = socket_data
 
     #collect socket statistics here:
-    all_time_differences = []
-    for socket_entry in http_stream_data_structure["socket_data"]:
-        for time_diff_entry in socket_entry["time_differences"]:
-            all_time_differences.append(time_diff_entry["time_difference_ms"])
+    all_time_differences = np.asarray([
+        time_diff_entry["time_difference_ms"]
+        for socket_entry in http_stream_data_structure["socket_data"]
+        for time_diff_entry in socket_entry["time_differences"]
+    ])
 
     # Calculate the socket statistics only if we have time differences
-    if all_time_differences:
-        # Sort the time differences for calculating median and other statistics
-        all_time_differences.sort()
-
-        # Calculate mean
-        mean_latency = sum(all_time_differences) / len(all_time_differences)
-
-        # Calculate median
-        mid = len(all_time_differences) // 2
-        median_latency = all_time_differences[mid] if len(all_time_differences) % 2 != 0 else (all_time_differences[mid-1] + all_time_differences[mid]) / 2
+    if all_time_differences.size > 0:
+        # Mean and median as NumPy reductions (converted back to Python numbers so they stay JSON serializable)
+        mean_latency = float(all_time_differences.mean())
+        median_latency = float(np.median(all_time_differences))
 
         # Calculate min, max, and range
-        min_latency = all_time_differences[0]
-        max_latency = all_time_differences[-1]
+        min_latency = all_time_differences.min().item()
+        max_latency = all_time_differences.max().item()
         range_latency = max_latency - min_latency
 
         # Create socket_statistics object
@@ -2,12 +2,26 @@ import os
 import json
 import sys
 
+# orjson parses the large test files several times faster than the json module, but is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def load_json(filepath):
     """
     Load the data we need, stored in JSON format.
     """
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"File not found: {filepath}")
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (ex: NaN/Infinity values, integers over 64 bits), let json handle those files
+            return json.loads(data)
     with open(filepath, 'r') as f:
         return json.load(f)
 